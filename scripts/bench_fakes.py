@@ -0,0 +1,425 @@
+"""
+benchmark.py용 가짜 Discord/블로그 백엔드
+
+실제 봇 토큰이나 외부 블로그 없이 스크립트의 처리 흐름을 그대로 실행할 수 있도록
+스크립트가 사용하는 discord.py 객체의 속성/메서드만 흉내 냅니다.
+
+- FakeDiscordAPI: 요청 종류별 횟수 집계, 고정 지연, 일정 비율의 429
+  (discord.py HTTP 클라이언트처럼 retry_after만큼 기다렸다가 다시 요청한 것으로 처리)
+- build_forum: 시드 기반으로 N개의 합성 스레드(메시지/반응/첨부/링크)를 가진 포럼 채널 생성
+- BlogServer: og:image가 있는/없는 글, 404, ETag 재검증을 제공하는 로컬 HTTP 서버
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import discord
+from discord.utils import time_snowflake
+
+# 1x1 투명 PNG
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082"
+)
+
+
+class FakeResponse:
+    """discord.HTTPException 생성에 필요한 최소 응답 객체"""
+
+    def __init__(self, status: int, reason: str):
+        self.status = status
+        self.reason = reason
+
+
+class FakeDiscordAPI:
+    """가짜 Discord API 호출 집계 및 지연/429 시뮬레이션"""
+
+    def __init__(self, latency: float = 0.005, rate_limit_ratio: float = 0.0,
+                 retry_after: float = 0.05, seed: int = 0):
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.rate_limited = 0
+
+    async def request(self, route: str):
+        self.requests[route] += 1
+        await asyncio.sleep(self.latency)
+        if self.rate_limit_ratio and self.rng.random() < self.rate_limit_ratio:
+            # discord.py는 429를 받으면 retry_after만큼 기다린 뒤 같은 요청을 다시 보냄
+            self.rate_limited += 1
+            self.requests[route] += 1
+            await asyncio.sleep(self.retry_after + self.latency)
+
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeUser:
+    """작성자/멤버 (DM 전송 가능)"""
+
+    def __init__(self, api: FakeDiscordAPI, user_id: int, name: str, dm_forbidden: bool = False):
+        self.api = api
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = FakeAsset(f"https://cdn.example.invalid/avatars/{user_id}.png")
+        self.dm_forbidden = dm_forbidden
+
+    async def send(self, content=None, **kwargs):
+        await self.api.request("send_dm")
+        if self.dm_forbidden:
+            raise discord.Forbidden(FakeResponse(403, "Forbidden"), "Cannot send messages to this user")
+
+
+class FakeReaction:
+    def __init__(self, count: int):
+        self.count = count
+
+
+class FakeAttachment:
+    def __init__(self, url: str, content_type: str):
+        self.url = url
+        self.content_type = content_type
+
+
+class FakeMessage:
+    def __init__(self, message_id: int, content: str, author: FakeUser,
+                 attachments: Optional[list] = None, reactions: Optional[list] = None):
+        self.id = message_id
+        self.content = content
+        self.author = author
+        self.attachments = attachments or []
+        self.reactions = reactions or []
+        self.embeds = []
+        self.edited_at = None
+
+
+class FakeThread:
+    """포럼 스레드 (시작 메시지는 캐시되지 않은 상태)"""
+
+    def __init__(self, api: FakeDiscordAPI, guild: "FakeGuild", thread_id: int, name: str,
+                 created_at: datetime, owner: FakeUser, starter: Optional[FakeMessage],
+                 total_messages: int, message_count: int, archived: bool,
+                 archive_timestamp: datetime):
+        self.api = api
+        self.guild = guild
+        self.id = thread_id
+        self.parent_id = guild.id + 1
+        self.name = name
+        self.created_at = created_at
+        self.owner_id = owner.id
+        self.owner = None  # chunk_guilds_at_startup=False라 멤버 캐시가 비어 있는 상태
+        self.author = owner
+        self.starter = starter
+        self.starter_message = None
+        self.total_messages = total_messages
+        self.message_count = message_count
+        self.archived = archived
+        self.archive_timestamp = archive_timestamp
+        self.last_message_id = thread_id + total_messages
+        self.jump_url = f"https://discord.com/channels/{guild.id}/{thread_id}"
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.api.request("fetch_message")
+        if self.starter is None or message_id != self.id:
+            raise discord.NotFound(FakeResponse(404, "Not Found"), "Unknown Message")
+        return self.starter
+
+    async def history(self, limit: Optional[int] = 100, **kwargs):
+        # 100개당 1회 요청
+        remaining = self.total_messages if limit is None else min(limit, self.total_messages)
+        index = 0
+        while remaining > 0:
+            await self.api.request("history")
+            for _ in range(min(100, remaining)):
+                yield FakeMessage(self.id + index, "", self.author)
+                index += 1
+            remaining -= 100
+
+
+class FakeGuild:
+    def __init__(self, api: FakeDiscordAPI, guild_id: int):
+        self.api = api
+        self.id = guild_id
+        self.active: Dict[int, FakeThread] = {}
+        self.all_threads: Dict[int, FakeThread] = {}
+        self.members: Dict[int, FakeUser] = {}
+
+    def get_thread(self, thread_id: int) -> Optional[FakeThread]:
+        return self.active.get(thread_id)
+
+    async def active_threads(self) -> List[FakeThread]:
+        await self.api.request("active_threads")
+        return list(self.active.values())
+
+    async def fetch_channel(self, channel_id: int) -> FakeThread:
+        await self.api.request("fetch_channel")
+        thread = self.all_threads.get(channel_id)
+        if thread is None:
+            raise discord.NotFound(FakeResponse(404, "Not Found"), "Unknown Channel")
+        return thread
+
+    def get_member(self, user_id: int) -> Optional[FakeUser]:
+        return None
+
+    async def fetch_member(self, user_id: int) -> FakeUser:
+        await self.api.request("fetch_member")
+        member = self.members.get(user_id)
+        if member is None:
+            raise discord.NotFound(FakeResponse(404, "Not Found"), "Unknown Member")
+        return member
+
+    async def query_members(self, query: str, limit: int = 5, **kwargs) -> List[FakeUser]:
+        await self.api.request("query_members")
+        return [member for member in self.members.values() if member.name.startswith(query)][:limit]
+
+
+class FakeForumChannel(discord.ForumChannel):
+    """
+    isinstance(channel, discord.ForumChannel) 검사를 통과하는 가짜 포럼 채널
+    (부모 생성자는 호출하지 않고 스크립트가 쓰는 속성만 채움)
+    """
+
+    def __init__(self, api: FakeDiscordAPI, guild: FakeGuild, name: str,
+                 active: List[FakeThread], archived: List[FakeThread]):
+        self.api = api
+        self.guild = guild
+        self.id = guild.id + 1  # FakeThread.parent_id와 같은 값
+        self.name = name
+        self._active = active
+        # 최근 아카이브 순 (Discord API와 같은 순서)
+        self._archived = sorted(archived, key=lambda thread: thread.archive_timestamp, reverse=True)
+
+    def __repr__(self):
+        return f"<FakeForumChannel name={self.name!r} threads={len(self._active) + len(self._archived)}>"
+
+    @property
+    def threads(self) -> List[FakeThread]:
+        return list(self._active)
+
+    async def archived_threads(self, *, limit: Optional[int] = 100, before=None, **kwargs):
+        # discord.py처럼 100개마다 한 페이지씩 요청
+        await self.api.request("archived_threads")
+        count = 0
+        for thread in self._archived:
+            if before is not None and thread.archive_timestamp >= before:
+                continue
+            if limit is not None and count >= limit:
+                return
+            if count and count % 100 == 0:
+                await self.api.request("archived_threads")
+            yield thread
+            count += 1
+
+
+class FakeClient:
+    """fetch_forum_data.client 대신 쓰는 최소 클라이언트"""
+
+    def __init__(self, api: FakeDiscordAPI, channel: FakeForumChannel):
+        self.api = api
+        self.channel = channel
+        self.user = "benchmark-bot#0000"
+
+    async def fetch_channel(self, channel_id) -> FakeForumChannel:
+        await self.api.request("fetch_channel")
+        return self.channel
+
+
+def build_forum(api: FakeDiscordAPI, thread_count: int, blog_base_urls: List[str],
+                seed: int = 0, now: Optional[datetime] = None) -> FakeForumChannel:
+    """
+    시드 기반 합성 포럼 생성
+
+    - 작성자 수는 스레드 20개당 1명 (최소 10명)
+    - 약 10%는 활성 스레드, 5%는 message_count가 50에서 멈춘 2022-07 이전 스레드
+      (history를 훑어 메시지 수를 세는 경로)
+    - 시작 메시지의 70%는 블로그 링크(그중 20%는 다른 스레드와 같은 글), 15%는 이미지 첨부, 2%는 삭제됨
+    - 글 n은 blog_base_urls[n % len(blog_base_urls)] 블로그에 있음 (여러 도메인에 나뉜 링크)
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    guild = FakeGuild(api, 100000000000000000)
+
+    author_count = max(10, thread_count // 20)
+    authors = [FakeUser(api, 200000000000000000 + i, f"author{i:05d}") for i in range(author_count)]
+    for author in authors:
+        guild.members[author.id] = author
+
+    active, archived = [], []
+    for i in range(thread_count):
+        legacy = rng.random() < 0.05
+        if legacy:
+            created_at = datetime(2021, 1, 1, tzinfo=timezone.utc) + timedelta(days=rng.uniform(0, 500))
+        else:
+            created_at = now - timedelta(days=rng.uniform(0, 365))
+        thread_id = time_snowflake(created_at) + i
+        owner = rng.choice(authors)
+
+        replies = rng.randint(50, 150) if legacy else rng.randint(0, 30)
+        roll = rng.random()
+        attachments = []
+        content = f"합성 글 {i} 본문입니다. " * rng.randint(3, 30)
+        if roll < 0.70:
+            # 20%는 다른 글과 같은 글을 링크 (추적 파라미터/마크다운 표기만 다름)
+            target = i if rng.random() < 0.8 else rng.randrange(max(1, thread_count // 10))
+            link = f"{blog_base_urls[target % len(blog_base_urls)]}/post/{target}"
+            if rng.random() < 0.3:
+                link += "?utm_source=discord"
+            content += f"\n[글 보기]({link})" if rng.random() < 0.3 else f"\n{link}"
+        elif roll < 0.85:
+            attachments.append(FakeAttachment(f"{blog_base_urls[i % len(blog_base_urls)]}/img/{i}.png", "image/png"))
+        reactions = [FakeReaction(rng.randint(1, 5)) for _ in range(rng.randint(0, 3))]
+        starter = None if rng.random() < 0.02 else FakeMessage(thread_id, content, owner, attachments, reactions)
+
+        is_active = not legacy and rng.random() < 0.10
+        archive_timestamp = min(now, created_at + timedelta(hours=rng.uniform(1, 24 * 7)))
+        thread = FakeThread(
+            api, guild, thread_id, f"합성 스레드 {i}", created_at, owner, starter,
+            total_messages=replies + 1,
+            message_count=min(replies, 50) if legacy else replies,
+            archived=not is_active,
+            archive_timestamp=archive_timestamp,
+        )
+        guild.all_threads[thread_id] = thread
+        if is_active:
+            guild.active[thread_id] = thread
+            active.append(thread)
+        else:
+            archived.append(thread)
+
+    return FakeForumChannel(api, guild, "benchmark-forum", active, archived)
+
+
+def build_members(api: FakeDiscordAPI, count: int, seed: int = 0) -> Dict[str, FakeUser]:
+    """DM 대상 멤버 (2%는 DM 거부)"""
+    rng = random.Random(seed)
+    return {
+        f"member{i:05d}": FakeUser(api, 300000000000000000 + i, f"member{i:05d}", dm_forbidden=rng.random() < 0.02)
+        for i in range(count)
+    }
+
+
+class BlogServer:
+    """
+    합성 블로그 글을 제공하는 로컬 HTTP 서버
+
+        /post/{n}   n % 10 == 9 → 404, n % 10 == 8 → og:image 없음, 나머지는 og:image 있음
+                    (<head> 뒤에 큰 본문, ETag 재검증 지원)
+        /img/{n}.png 작은 PNG
+
+    hosts개의 루프백 주소(127.0.0.1, 127.0.0.2, ...)에서 같은 내용을 제공해 서로 다른 도메인의
+    블로그처럼 쓸 수 있습니다. (127.0.0.2 이상을 열 수 없는 환경에서는 127.0.0.1 하나만 사용)
+    """
+
+    def __init__(self, latency: float = 0.0, body_bytes: int = 64 * 1024, hosts: int = 1):
+        self.latency = latency
+        self.body_bytes = body_bytes
+        self.hosts = max(1, hosts)
+        self.requests: Counter = Counter()
+        # 서버가 보낸 바이트 (클라이언트가 <head>까지만 읽고 끊어도 소켓 버퍼에 쓴 만큼 포함)
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._servers: List[ThreadingHTTPServer] = []
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def base_urls(self) -> List[str]:
+        return [f"http://{host}:{port}" for host, port in (server.server_address[:2] for server in self._servers)]
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    def _count(self, kind: str, size: int):
+        with self._lock:
+            self.requests[kind] += 1
+            self.bytes_sent += size
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None, kind: str = ""):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # <head>까지만 읽고 연결을 끊는 클라이언트
+                    pass
+                server._count(kind or str(status), len(body))
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parts = self.path.strip("/").split("/")
+                if len(parts) == 2 and parts[0] == "img":
+                    self._send(200, PIXEL_PNG, {"Content-Type": "image/png"}, "image")
+                    return
+                if len(parts) != 2 or parts[0] != "post" or not parts[1].isdigit():
+                    self._send(404, b"not found", kind="404")
+                    return
+
+                number = int(parts[1])
+                if number % 10 == 9:
+                    self._send(404, b"not found", kind="404")
+                    return
+
+                etag = f'"post-{number}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag}, kind="304")
+                    return
+
+                meta = "" if number % 10 == 8 else (
+                    f'<meta property="og:image" content="/img/{number}.png">'
+                )
+                head = (
+                    f"<!doctype html><html><head><meta charset=\"utf-8\"><title>글 {number}</title>"
+                    f"{meta}</head>"
+                )
+                body = "<body>" + "<p>합성 본문</p>" * (server.body_bytes // 30) + "</body></html>"
+                self._send(200, (head + body).encode("utf-8"), {
+                    "Content-Type": "text/html; charset=utf-8",
+                    "ETag": etag,
+                }, "page")
+
+        for i in range(self.hosts):
+            try:
+                http_server = ThreadingHTTPServer((f"127.0.0.{i + 1}", 0), Handler)
+            except OSError:
+                break
+            http_server.daemon_threads = True
+            thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+            thread.start()
+            self._servers.append(http_server)
+            self._threads.append(thread)
+
+    def stop(self):
+        for http_server in self._servers:
+            http_server.shutdown()
+            http_server.server_close()
+        self._servers.clear()
+        self._threads.clear()
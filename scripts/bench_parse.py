@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+HTML 파싱 벤치마크
+
+1. 파서 백엔드별 처리량: 큰 블로그 글 페이지 전체와 <head>만 파싱했을 때의 초당 페이지 수/MB
+2. 실행 방식별 겹침: 가짜 네트워크 대기 후 파싱하는 작업을 동시에 실행하며
+   전체 시간과 이벤트 루프 지연(최대 멈춤 시간)을 비교
+   - inline   이벤트 루프에서 바로 파싱 (이전 방식)
+   - thread   스레드 풀
+   - process  프로세스 풀
+
+실제 페이지로 측정하려면 저장한 HTML 파일을 --files로 넘깁니다.
+없으면 Velog/Tistory 글처럼 <head>에 인라인 CSS/스크립트/JSON-LD가 많은 합성 페이지를 사용합니다.
+
+사용법 (scripts 디렉토리에서):
+    python bench_parse.py
+    python bench_parse.py --files saved/*.html --tasks 64
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Callable, List, Optional
+
+from preview_parser import available_backends, create_executor, extract_preview_image
+
+HEAD_END = b"</head>"
+
+
+def synthesize_page(index: int, rng: random.Random, body_kb: int = 400) -> bytes:
+    """<head>에 인라인 CSS/스크립트/메타 태그가 많은 큰 블로그 글 페이지"""
+    css = "".join(f".c{i}{{margin:{i % 7}px;color:#{i % 4096:03x}}}" for i in range(rng.randint(800, 1500)))
+    metas = "".join(f'<meta name="keyword{i}" content="키워드 {i}">' for i in range(40))
+    script = "window.__STATE__=" + "{" + ",".join(f'"k{i}":"{"값" * 10}"' for i in range(400)) + "}"
+    head = (
+        f'<!doctype html><html lang="ko"><head><meta charset="utf-8"><title>글 {index}</title>'
+        f"<style>{css}</style>{metas}<script>{script}</script>"
+        f'<meta property="og:image" content="/images/{index}.png"></head>'
+    )
+    paragraph = "<p>본문 <a href='https://example.com'>링크</a> <code>code</code> 문단입니다.</p>"
+    body = "<body><article>" + paragraph * (body_kb * 1024 // len(paragraph.encode())) + "</article></body></html>"
+    return (head + body).encode("utf-8")
+
+
+def head_only(page: bytes) -> bytes:
+    end = page.find(HEAD_END)
+    return page if end < 0 else page[:end]
+
+
+def throughput(pages: List[bytes], backend: str, repeat: int) -> tuple:
+    """(초당 페이지 수, 초당 MB)"""
+    total_bytes = sum(len(page) for page in pages) * repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract_preview_image(page, "https://example.com/post", "utf-8", backend)
+    elapsed = time.perf_counter() - started
+    return len(pages) * repeat / elapsed, total_bytes / 1024 / 1024 / elapsed
+
+
+async def overlap_run(
+    pages: List[bytes],
+    tasks: int,
+    network_latency: float,
+    backend: str,
+    mode: str,
+) -> tuple:
+    """
+    tasks개의 (네트워크 대기 → 파싱) 작업을 동시에 실행
+
+    Returns:
+        (전체 시간, 이벤트 루프 최대 지연(ms))
+    """
+    loop = asyncio.get_running_loop()
+    executor = None if mode == "inline" else create_executor(mode)
+    parse: Callable
+    if executor is None:
+        async def parse(page: bytes) -> Optional[str]:
+            return extract_preview_image(page, "https://example.com/post", "utf-8", backend)
+    else:
+        async def parse(page: bytes) -> Optional[str]:
+            return await loop.run_in_executor(
+                executor, extract_preview_image, page, "https://example.com/post", "utf-8", backend
+            )
+
+    # 10ms마다 깨어나는 작업이 실제로 얼마나 늦게 깨어나는지 측정
+    max_lag = 0.0
+    stop = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not stop.is_set():
+            expected = loop.time() + 0.01
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, loop.time() - expected)
+
+    async def job(i: int):
+        await asyncio.sleep(network_latency)
+        await parse(pages[i % len(pages)])
+
+    ticker_task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(job(i) for i in range(tasks)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker_task
+    if executor is not None:
+        executor.shutdown(wait=True)
+    return elapsed, max_lag * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드/실행 방식별 성능 비교")
+    parser.add_argument("--files", nargs="*", help="측정에 사용할 저장된 HTML 파일")
+    parser.add_argument("--pages", type=int, default=8, help="합성 페이지 수 (--files가 없을 때)")
+    parser.add_argument("--repeat", type=int, default=3, help="처리량 측정 반복 횟수")
+    parser.add_argument("--tasks", type=int, default=32, help="겹침 측정의 동시 작업 수")
+    parser.add_argument("--network-latency", type=float, default=0.05, help="작업당 가짜 네트워크 대기 (초)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.files:
+        pages = []
+        for path in args.files:
+            with open(path, "rb") as f:
+                pages.append(f.read())
+    else:
+        rng = random.Random(args.seed)
+        pages = [synthesize_page(i, rng) for i in range(args.pages)]
+    heads = [head_only(page) for page in pages]
+    average_kb = sum(len(page) for page in pages) / len(pages) / 1024
+    average_head_kb = sum(len(head) for head in heads) / len(heads) / 1024
+    print(f"📄 페이지 {len(pages)}개 (평균 {average_kb:.0f}KB, <head> 평균 {average_head_kb:.0f}KB)\n")
+
+    backends = available_backends()
+    print(f"{'backend':<13}{'input':<8}{'pages/s':>10}{'MB/s':>9}")
+    for backend in backends:
+        for label, inputs in (("full", pages), ("head", heads)):
+            pages_per_second, mb_per_second = throughput(inputs, backend, args.repeat)
+            print(f"{backend:<13}{label:<8}{pages_per_second:>10.1f}{mb_per_second:>9.2f}")
+
+    print(f"\n동시 작업 {args.tasks}개 (네트워크 대기 {args.network_latency * 1000:.0f}ms + <head> 파싱)")
+    print(f"{'backend':<13}{'mode':<9}{'wall(s)':>9}{'loop lag(ms)':>14}")
+    for backend in backends:
+        for mode in ("inline", "thread", "process"):
+            elapsed, lag = asyncio.run(overlap_run(heads, args.tasks, args.network_latency, backend, mode))
+            print(f"{backend:<13}{mode:<9}{elapsed:>9.3f}{lag:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
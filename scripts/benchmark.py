@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+오프라인 벤치마크
+
+봇 토큰이나 실제 블로그 없이 bench_fakes의 가짜 Discord 포럼과 로컬 블로그 서버로
+각 스크립트의 핵심 단계를 실행하고, 스레드 수별로 다음 값을 측정합니다.
+
+- 전체 소요 시간 (wall time)
+- Discord API 요청 수 (429 재시도 포함)와 429 횟수
+- 블로그 HTTP 요청 수와 전송량
+- 최대 메모리 사용량 (tracemalloc 기준, 측정 오버헤드로 실행 시간이 다소 늘어남)
+
+측정 대상:
+    fetch_data (cold)   빈 캐시/스냅샷에서 fetch_forum_data.fetch_data 실행
+    fetch_data (warm)   같은 포럼으로 한 번 더 실행 (증분 동기화/캐시 재사용)
+    weekly_check        weekly_check.fetch_forum_threads (모든 스레드가 조회 기간에 들어가도록)
+    dm                  weekly_dm_reminder.send_dms_to_non_authors (스레드 수만큼의 멤버)
+
+사용법 (scripts 디렉토리에서):
+    python benchmark.py --sizes 100,1000,10000 --json bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List
+
+import fetch_forum_data
+import weekly_check
+import weekly_dm_reminder
+from bench_fakes import BlogServer, FakeClient, FakeDiscordAPI, build_forum, build_members
+from metrics import metrics
+from time_budget import TimeBudget
+
+SCENARIOS = ("fetch_data", "weekly_check", "dm")
+
+
+async def measure(
+    name: str,
+    size: int,
+    api: FakeDiscordAPI,
+    blog: BlogServer,
+    run: Callable[[], Awaitable],
+    verbose: bool,
+) -> dict:
+    """run()을 실행하며 시간/요청 수/최대 메모리를 측정"""
+    api_before = api.total_requests()
+    rate_limited_before = api.rate_limited
+    blog_before = blog.total_requests()
+    blog_bytes_before = blog.bytes_sent
+
+    metrics.reset()
+    tracemalloc.start()
+    started = time.perf_counter()
+    if verbose:
+        await run()
+    else:
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            await run()
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "threads": size,
+        "wall_seconds": round(wall, 3),
+        "discord_requests": api.total_requests() - api_before,
+        "rate_limited": api.rate_limited - rate_limited_before,
+        "http_requests": blog.total_requests() - blog_before,
+        "http_bytes": blog.bytes_sent - blog_bytes_before,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+        # 스크립트 내부 계측 (단계 시간, 카운터, 호출별 지연)
+        "metrics": metrics.summary(name),
+    }
+
+
+async def bench_size(size: int, scenarios: List[str], args: argparse.Namespace, blog: BlogServer) -> List[dict]:
+    """스레드 수 하나에 대해 선택한 시나리오 실행"""
+    results = []
+    now = datetime.now(timezone.utc)
+
+    with tempfile.TemporaryDirectory(prefix="forum-bench-") as workdir:
+        api = FakeDiscordAPI(args.latency, args.rate_limit_ratio, args.retry_after, seed=args.seed)
+        channel = build_forum(api, size, blog.base_urls, seed=args.seed, now=now)
+
+        # 스크립트의 출력/캐시 경로는 임시 디렉토리로 지정
+        # (--rest-only면 활성 스레드를 캐시 대신 REST로 조회)
+        client = FakeClient(api, channel)
+        snapshot_path = os.path.join(workdir, "weekly-snapshot.json")
+
+        if "fetch_data" in scenarios:
+            # --time-budget이 있으면 실행마다 새 예산 (warm 실행이 cold에서 미룬 스레드를 이어서 처리)
+            def run_fetch_data():
+                budget = TimeBudget(args.time_budget) if args.time_budget else None
+                return fetch_forum_data.fetch_data(
+                    budget,
+                    discord_client=client,
+                    output_dir=os.path.join(workdir, "public"),
+                    cache_dir=workdir,
+                    full_sync=False,
+                    localize_thumbnails=False,
+                    rest_only=args.rest_only,
+                )
+
+            for label in ("fetch_data (cold)", "fetch_data (warm)"):
+                results.append(await measure(label, size, api, blog, run_fetch_data, args.verbose))
+
+        if "weekly_check" in scenarios:
+            start_date = min(thread.created_at for thread in channel.guild.all_threads.values())
+            results.append(await measure(
+                "weekly_check", size, api, blog,
+                lambda: weekly_check.fetch_forum_threads(
+                    channel, start_date, now, snapshot_path=snapshot_path, rest_only=args.rest_only
+                ),
+                args.verbose,
+            ))
+
+        if "dm" in scenarios:
+            members = build_members(api, size, seed=args.seed)
+            results.append(await measure(
+                "dm", size, api, blog,
+                lambda: weekly_dm_reminder.send_dms_to_non_authors(
+                    members, now, ledger_path=os.path.join(workdir, "dm-ledger.json")
+                ),
+                args.verbose,
+            ))
+
+    return results
+
+
+def print_table(results: List[dict]):
+    header = f"{'scenario':<20}{'threads':>8}{'wall(s)':>10}{'discord':>9}{'429':>6}{'http':>7}{'http KB':>10}{'peak MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['scenario']:<20}{result['threads']:>8}{result['wall_seconds']:>10.3f}"
+            f"{result['discord_requests']:>9}{result['rate_limited']:>6}{result['http_requests']:>7}"
+            f"{result['http_bytes'] / 1024:>10.1f}{result['peak_memory_mb']:>9.2f}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> List[dict]:
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",") if scenario.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"❌ 알 수 없는 시나리오: {', '.join(sorted(unknown))} (가능: {', '.join(SCENARIOS)})")
+
+    # DM 재시도 지터 등 스크립트 내부의 random도 고정
+    random.seed(args.seed)
+
+    blog = BlogServer(latency=args.blog_latency, hosts=args.blog_hosts)
+    blog.start()
+    try:
+        results = []
+        for size in sizes:
+            print(f"⏱️  스레드 {size}개 측정 중...", file=sys.stderr)
+            results.extend(await bench_size(size, scenarios, args, blog))
+        return results
+    finally:
+        blog.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 Discord/블로그 백엔드로 스크립트 성능 측정")
+    parser.add_argument("--sizes", default="100,1000,10000", help="스레드 수 목록 (쉼표 구분)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="측정할 시나리오 (쉼표 구분)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Discord API 요청당 지연 (초)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.01, help="429 응답 비율")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="429 응답의 retry_after (초)")
+    parser.add_argument("--blog-latency", type=float, default=0.005, help="블로그 요청당 지연 (초)")
+    parser.add_argument("--blog-hosts", type=int, default=8, help="링크를 나눠 둘 블로그 도메인 수 (루프백 주소)")
+    parser.add_argument("--time-budget", type=float, default=0, help="fetch_data 실행당 시간 예산 (초, 0이면 제한 없음)")
+    parser.add_argument("--rest-only", action="store_true", help="DISCORD_REST_ONLY 실행 경로로 측정")
+    parser.add_argument("--seed", type=int, default=42, help="합성 데이터 시드")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="스크립트 출력 표시")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
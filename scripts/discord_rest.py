@@ -0,0 +1,46 @@
+"""
+게이트웨이 없이 REST API만으로 실행
+
+세 스크립트는 몇 개의 REST 엔드포인트만 쓰는 배치 작업입니다. DISCORD_REST_ONLY=1 이면
+웹소켓 연결(IDENTIFY, 서버 정보 수신, READY 대기)을 생략하고 HTTP 클라이언트만 로그인한 뒤
+바로 작업을 시작합니다. 서버/채널/멤버 캐시가 비어 있으므로 필요한 것은 REST로 조회합니다.
+
+- 채널: client.fetch_channel (get_or_fetch_channel)
+- 포럼 활성 스레드: guild.active_threads() (forum_snapshot.list_active_threads)
+- 이름으로 멤버 찾기: guild.fetch_members (member_index.MemberIndex, query_members는 게이트웨이 필요)
+"""
+
+import os
+from typing import Awaitable, Callable, Optional
+
+import discord
+
+from metrics import metrics
+
+REST_ONLY = os.getenv("DISCORD_REST_ONLY", "").lower() in ("1", "true", "yes")
+
+
+async def run_rest_only(client: discord.Client, token: str, main: Callable[[], Awaitable[None]]):
+    """
+    게이트웨이에 연결하지 않고 HTTP 클라이언트만 로그인한 뒤 main() 실행
+
+    client.start() 대신 사용하며, main은 보통 기존 on_ready 핸들러입니다.
+    (로그인 실패 시 client.start()와 같이 discord.LoginFailure 발생)
+    """
+    async with client:
+        with metrics.phase("login"):
+            await client.login(token)
+        await main()
+
+
+async def get_or_fetch_channel(client: discord.Client, channel_id: int) -> Optional[discord.abc.GuildChannel]:
+    """캐시에 있는 채널은 그대로, 없으면 REST로 조회 (없거나 접근 권한이 없으면 None)"""
+    channel = client.get_channel(channel_id)
+    if channel is not None:
+        return channel
+    try:
+        with metrics.timer("discord.fetch_channel"):
+            return await client.fetch_channel(channel_id)
+    except (discord.NotFound, discord.Forbidden):
+        return None
+
@@ -0,0 +1,60 @@
+"""
+DM 전송 기록(ledger)
+
+weekly_dm_reminder.py가 중간에 실패했거나 워크플로우를 다시 실행했을 때
+이미 DM을 받은 멤버에게 같은 주에 다시 보내지 않도록 (ISO 주차, 멤버 id)별
+전송 완료 시각을 기록합니다. 전송에 성공할 때마다 파일을 다시 씁니다. (json_store.atomic_write_json)
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Dict
+
+from json_store import atomic_write_json, load_json
+
+LEDGER_VERSION = 1
+
+# 기본 ledger 파일 (워크플로우에서 actions/cache로 보존)
+DEFAULT_LEDGER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "dm-ledger.json")
+
+# 이만큼 지난 주차의 기록은 불러올 때 정리
+KEEP_WEEKS = 8
+
+
+def iso_week_key(date: datetime) -> str:
+    """날짜가 속한 ISO 주차 키 (예: 2025-W47)"""
+    year, week, _ = date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class DeliveryLedger:
+    """(ISO 주차, 멤버 id)별 DM 전송 기록"""
+
+    def __init__(self, week_key: str, path: str = DEFAULT_LEDGER_FILE):
+        self.week_key = week_key
+        self.path = path
+        self.weeks: Dict[str, Dict[str, str]] = {}
+
+    def load(self):
+        """ledger 파일 읽기 (오래된 주차는 정리)"""
+        data = load_json(self.path, {}, "DM 전송 기록")
+        if data.get("version") != LEDGER_VERSION:
+            return
+
+        weeks = data.get("weeks", {})
+        # 주차 키는 사전순 = 시간순
+        for week_key in sorted(weeks, reverse=True)[:KEEP_WEEKS]:
+            self.weeks[week_key] = weeks[week_key]
+
+    def _save(self):
+        atomic_write_json(self.path, {"version": LEDGER_VERSION, "weeks": self.weeks})
+
+    def is_delivered(self, member_id: int) -> bool:
+        """이번 주차에 이미 DM을 보낸 멤버인지 확인"""
+        return str(member_id) in self.weeks.get(self.week_key, {})
+
+    def record(self, member_id: int):
+        """DM 전송 성공을 기록하고 즉시 저장"""
+        week = self.weeks.setdefault(self.week_key, {})
+        week[str(member_id)] = datetime.now(timezone.utc).isoformat()
+        self._save()
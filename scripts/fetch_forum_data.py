@@ -1,10 +1,33 @@
 ﻿import discord
 import os
+import argparse
+import asyncio
+import contextlib
 import json
 import sys
-import re  # (Goal 1) URL 추출을 위해 임포트
+import re
+from datetime import datetime, timedelta, timezone
 import httpx # (Goal 2) 웹페이지 요청을 위해 임포트
-from bs4 import BeautifulSoup # (Goal 2) HTML 파싱을 위해 임포트
+from discord_rest import REST_ONLY, run_rest_only
+from metrics import metrics
+from host_scheduler import BACKOFF_STATUS_CODES, HTTP2_AVAILABLE, HostScheduler, create_http_client
+from link_extract import canonicalize_url, extract_links, is_image_link, pick_article_link
+from og_cache import OGImageCache
+from preview_parser import get_executor, parse_preview_image, resolve_backend, shutdown_executor
+from forum_snapshot import ForumSnapshot, resolve_threads, sync_forum_snapshot, verify_stale_records
+from forum_export import (
+    precompress_and_report,
+    write_compact_posts,
+    write_digest_index,
+    write_json,
+    write_rankings,
+    write_search_index,
+    write_sharded_export,
+)
+from single_flight import SingleFlight
+from text_digest import build_digest
+from thumbnail_store import ThumbnailStore
+from time_budget import TimeBudget, TimeBudgetExceeded
 
 # --- 설정 ---
 TOKEN = os.environ.get('DISCORD_TOKEN')
@@ -15,12 +38,90 @@ except ValueError:
     sys.exit(1)
 
 OUTPUT_DIR = os.path.join(os.getcwd(), 'public') 
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'forum-posts.json')
+OUTPUT_FILE_NAME = 'forum-posts.json'
+
+# 동시에 보낼 Discord 요청 수 (스레드 시작 메시지 조회)
+try:
+    FETCH_CONCURRENCY = max(1, int(os.environ.get('FETCH_CONCURRENCY', '8')))
+except ValueError:
+    print("❌ FETCH_CONCURRENCY가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+
+# 포럼 스냅샷/캐시 디렉토리. 워크플로우에서 커밋되어 다음 실행 때 재사용됩니다.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+SNAPSHOT_FILE_NAME = 'forum-snapshot.json'
+
+# 링크 썸네일(og:image) 캐시 파일
+OG_CACHE_FILE_NAME = 'og-image-cache.json'
+
+# FULL_SYNC=1 이면 전체 아카이브를 다시 훑고 모든 스레드를 다시 처리합니다.
+FULL_SYNC = os.environ.get('FULL_SYNC', '').lower() in ('1', 'true', 'yes')
+
+# 시작 메시지 수정은 스레드 정보로 알 수 없으므로, 마지막으로 가져온 지 이 기간(일)이 지난
+# 스레드는 바뀐 것이 없어 보여도 시작 메시지를 다시 가져옵니다.
+try:
+    STARTER_REFRESH_INTERVAL = timedelta(days=max(0.0, float(os.environ.get('STARTER_REFRESH_DAYS', '3'))))
+except ValueError:
+    print("❌ STARTER_REFRESH_DAYS가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+
+# 반응 수는 스레드 정보(last_message_id)를 바꾸지 않으므로, 트렌딩 순위에 영향이 큰 최근 글(일)은
+# 실행마다 시작 메시지를 다시 가져와 반응 수를 갱신합니다.
+try:
+    RECENT_REFRESH_WINDOW = timedelta(days=max(0.0, float(os.environ.get('RECENT_REFRESH_DAYS', '7'))))
+except ValueError:
+    print("❌ RECENT_REFRESH_DAYS가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+
+# 증분 동기화가 다시 훑지 않는 오래된 스레드를 실행마다 몇 개씩 개별 조회해 삭제 여부를 확인합니다.
+try:
+    SNAPSHOT_VERIFY_LIMIT = max(0, int(os.environ.get('SNAPSHOT_VERIFY_LIMIT', '20')))
+except ValueError:
+    print("❌ SNAPSHOT_VERIFY_LIMIT가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+
+# EXPORT_COMPACT=1 이면 JSON을 공백 없이 저장하고, 작성자 표를 분리한 forum-posts.min.json과
+# .gz/.br 사전 압축본을 함께 만듭니다.
+EXPORT_COMPACT = os.environ.get('EXPORT_COMPACT', '').lower() in ('1', 'true', 'yes')
+
+# LOCALIZE_THUMBNAILS=1 이면 썸네일을 내려받아 카드 크기의 WebP/JPEG 사본으로 바꿔 저장합니다. (Pillow 필요)
+# THUMBNAIL_DIR(기본: 출력 디렉토리의 thumbs)에 저장하고 글의 thumbnail은 THUMBNAIL_BASE_URL 아래 경로로 바꿉니다.
+LOCALIZE_THUMBNAILS = os.environ.get('LOCALIZE_THUMBNAILS', '').lower() in ('1', 'true', 'yes')
+THUMBNAIL_DIR = os.environ.get('THUMBNAIL_DIR')
+THUMBNAIL_BASE_URL = os.environ.get('THUMBNAIL_BASE_URL', 'thumbs/')
+THUMBNAIL_CACHE_FILE_NAME = 'thumbnail-cache.json'
+try:
+    THUMBNAIL_CONCURRENCY = max(1, int(os.environ.get('THUMBNAIL_CONCURRENCY', '4')))
+except ValueError:
+    print("❌ THUMBNAIL_CONCURRENCY가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+
+# 실행 시간 예산(초). 0이면 제한 없음. (--time-budget으로도 지정)
+# 예산이 부족해지면 최신 글부터 처리한 만큼만 내보내고, 나머지는 다음 실행에서 먼저 처리합니다.
+try:
+    TIME_BUDGET_SECONDS = max(0.0, float(os.environ.get('TIME_BUDGET_SECONDS') or '0'))
+except ValueError:
+    print("❌ TIME_BUDGET_SECONDS가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
 
 # (Goal 2) 웹사이트 스크래핑 시 봇 차단을 피하기 위한 User-Agent
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.0.0 Safari/537.36'
 }
+
+# 썸네일 탐색 시 내려받을 HTML 최대 크기. 미리보기 메타 태그는 <head>에 있으므로
+# </head>(또는 <body>)를 만나거나 이 크기를 넘으면 나머지 본문은 받지 않습니다.
+OG_MAX_HEAD_BYTES = 256 * 1024
+HEAD_END_PATTERN = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+
+# 썸네일 탐색 HTTP 요청 동시 처리 수 (전체 / 도메인별)와 429/503 응답 시 최대 시도 횟수
+try:
+    HTTP_CONCURRENCY = max(1, int(os.environ.get('HTTP_CONCURRENCY', '16')))
+    HTTP_PER_HOST_CONCURRENCY = max(1, int(os.environ.get('HTTP_PER_HOST_CONCURRENCY', '2')))
+except ValueError:
+    print("❌ HTTP_CONCURRENCY / HTTP_PER_HOST_CONCURRENCY가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+OG_MAX_ATTEMPTS = 3
 # ---
 
 # --- 봇 권한 설정 ---
@@ -30,33 +131,93 @@ intents.messages = True
 intents.message_content = True # content를 읽기 위해 필수!
 
 client = discord.Client(intents=intents)
+
+# 실행 시간 예산 (메인에서 로그인 전에 만들어 로그인 시간도 포함)
+time_budget: TimeBudget | None = None
 # ---
 
 
-async def get_og_image(session: httpx.AsyncClient, url: str) -> str | None:
+async def read_html_head(response: httpx.Response) -> bytes:
+    """스트리밍 응답에서 <head> 영역까지만 읽어 반환합니다."""
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        # 청크 경계에 걸친 태그도 찾을 수 있도록 직전 청크의 끝부분부터 검색
+        search_from = max(0, len(buffer) - 16)
+        buffer.extend(chunk)
+        metrics.incr("http.og_image.bytes", len(chunk))
+        head_end = HEAD_END_PATTERN.search(buffer, search_from)
+        if head_end:
+            return bytes(buffer[:head_end.start()])
+        if len(buffer) >= OG_MAX_HEAD_BYTES:
+            break
+    return bytes(buffer[:OG_MAX_HEAD_BYTES])
+
+
+async def get_og_image(
+    session: httpx.AsyncClient,
+    url: str,
+    og_cache: OGImageCache | None = None,
+    scheduler: HostScheduler | None = None,
+) -> str | None:
     """(Goal 2) 
     웹페이지 URL에서 Open Graph 이미지(썸네일)를 추출합니다.
+    og_cache가 주어지면 유효한 캐시 결과(실패 결과 포함)를 먼저 사용합니다.
+    scheduler가 주어지면 도메인별 동시 요청 상한을 지키고, 429/503을 받으면
+    해당 도메인을 잠시 쉬게 한 뒤 다시 시도합니다.
     """
     if not url:
         return None
+
+    # 만료된 캐시 항목의 ETag/Last-Modified로 조건부 요청 헤더 구성
+    conditional_headers = {}
+    if og_cache is not None:
+        found, cached_thumbnail = og_cache.lookup(url)
+        if found:
+            return cached_thumbnail
+        conditional_headers = og_cache.conditional_headers(url)
     
     try:
-        # 타임아웃을 10초로 설정
-        response = await session.get(url, follow_redirects=True, timeout=10.0)
-        response.raise_for_status() # 4xx, 5xx 에러 시 예외 발생
-        
-        # HTML 파싱
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 'og:image' 메타 태그 찾기
-        og_image_tag = soup.find('meta', property='og:image')
-        
-        if og_image_tag and og_image_tag.get('content'):
-            return og_image_tag['content'] # 썸네일 URL 반환
-            
-        return None
+        for attempt in range(1, OG_MAX_ATTEMPTS + 1):
+            async with (scheduler.slot(url) if scheduler else contextlib.nullcontext()):
+                # 타임아웃을 10초로 설정. 본문 전체 대신 <head>까지만 스트리밍으로 읽습니다.
+                with metrics.timer("http.og_image"):
+                    async with session.stream('GET', url, headers=conditional_headers, follow_redirects=True, timeout=10.0) as response:
+                        metrics.incr(f"http.og_image.status.{response.status_code}")
+                        if scheduler is not None:
+                            if response.status_code in BACKOFF_STATUS_CODES:
+                                # 도메인 전체를 잠시 쉬게 하고, 시도 횟수가 남았으면 다시 요청
+                                scheduler.backoff(url, response.headers.get('Retry-After'))
+                                if attempt < OG_MAX_ATTEMPTS:
+                                    continue
+                            else:
+                                scheduler.succeeded(url)
+                        if response.status_code == 304 and og_cache is not None:
+                            # 304 Not Modified: 본문 없이 캐시된 결과를 그대로 사용
+                            return og_cache.mark_revalidated(url)
+                        response.raise_for_status() # 4xx, 5xx 에러 시 예외 발생
+                        head_html = await read_html_head(response)
+                    # async with를 벗어나면 나머지 본문은 받지 않고 연결을 닫습니다.
+            break
+
+        # 'og:image' (없으면 twitter:image, image_src) 찾기
+        # CPU 작업인 파싱은 실행기로 넘겨 그동안 다른 요청이 계속 진행되도록 합니다.
+        with metrics.timer("parse.og_image"):
+            thumbnail = await parse_preview_image(head_html, str(response.url), response.charset_encoding)
+
+        if og_cache is not None:
+            og_cache.store(
+                url,
+                thumbnail,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+        return thumbnail
     except httpx.HTTPStatusError as e:
-        print(f"  (HTTP 오류) {url}: {e.response.status_code}", file=sys.stderr)
+        status_code = e.response.status_code
+        print(f"  (HTTP 오류) {url}: {status_code}", file=sys.stderr)
+        # 404 같은 4xx는 실패 결과로 캐시 (429는 일시적인 제한이므로 제외)
+        if og_cache is not None and 400 <= status_code < 500 and status_code != 429:
+            og_cache.store(url, None)
         return None
     except Exception as e:
         # 타임아웃, 연결 오류 등 모든 예외 처리
@@ -64,12 +225,180 @@ async def get_og_image(session: httpx.AsyncClient, url: str) -> str | None:
         return None
 
 
-async def fetch_data():
-    """데이터를 가져와 JSON 파일로 저장하는 메인 로직"""
-    print(f"'{client.user}'로 로그인했습니다.")
+def is_thread_unchanged(thread: discord.Thread, record: dict | None) -> bool:
+    """
+    마지막으로 내보낸 이후 스레드가 바뀌지 않았는지 확인합니다.
+    새 메시지가 달리면 last_message_id가 바뀌지만, 시작 메시지 수정은 스레드 정보에 드러나지 않습니다.
+    (edited_at은 새 프로세스에서는 거의 없는 메시지 캐시에 있을 때만 비교 가능)
+    따라서 시작 메시지를 가져온 지 STARTER_REFRESH_INTERVAL이 지났으면 바뀐 것으로 보고 다시 가져옵니다.
+    오래전에 아카이브된 스레드는 verify_stale_records로 조회될 때 이 검사를 거칩니다.
+    """
+    entry = record.get('export') if record else None
+    if not entry:
+        return False
+    if entry.get('last_message_id') != thread.last_message_id:
+        return False
+    fetched_at = entry.get('fetched_at')
+    if not fetched_at or datetime.now(timezone.utc) - datetime.fromisoformat(fetched_at) > STARTER_REFRESH_INTERVAL:
+        return False
+
+    starter_message = thread.starter_message
+    if starter_message is not None:
+        edited_at = starter_message.edited_at.isoformat() if starter_message.edited_at else None
+        if entry.get('edited_at') != edited_at:
+            return False
+    return True
+
+
+def export_post(record: dict) -> dict:
+    """스냅샷 레코드의 내보낼 글 (저장된 글 정보 + 레코드의 시작 메시지 본문)"""
+    post = record['export']['post']
+    return {"id": post['id'], "title": post['title'], "content": record.get('content') or '', **post}
+
+
+def find_embed_image(message: discord.Message, link: str | None) -> str | None:
+    """
+    Discord가 이미 만들어 둔 링크 미리보기(embed)의 이미지를 찾습니다. (추가 요청 없음)
+    link와 같은 글을 가리키는 embed를 우선합니다.
+    """
+    embeds = [embed for embed in message.embeds if embed.url]
+    if link:
+        link_key = canonicalize_url(link)
+        embeds.sort(key=lambda embed: canonicalize_url(embed.url) != link_key)
+    for embed in embeds:
+        image_url = embed.image.url or embed.thumbnail.url
+        if image_url:
+            return image_url
+    return None
+
+
+async def process_thread(
+    session: httpx.AsyncClient,
+    thread: discord.Thread,
+    og_cache: OGImageCache,
+    og_fetches: SingleFlight | None = None,
+    scheduler: HostScheduler | None = None,
+    discord_slots: asyncio.Semaphore | None = None,
+    budget: TimeBudget | None = None,
+    previous_post: dict | None = None,
+) -> tuple[discord.Message, dict] | None:
+    """
+    스레드 하나의 시작 메시지를 가져와 (시작 메시지, JSON 항목)으로 반환합니다.
+    og_fetches가 주어지면 같은 링크의 썸네일 탐색을 실행 전체에서 한 번만 요청합니다.
+    discord_slots는 Discord 요청에만, scheduler는 썸네일 탐색 요청에만 적용되므로
+    한쪽의 대기가 다른 쪽 요청을 막지 않습니다.
+    budget이 주어지면 남은 시간이 없을 때 TimeBudgetExceeded를 내고,
+    시간이 부족하면 썸네일 탐색을 건너뛰고 스레드를 다음 실행으로 미룹니다.
+    이때 previous_post(지난번 내보낸 항목)가 같은 링크의 썸네일을 갖고 있으면 그대로 씁니다.
+    """
+    try:
+        async with (discord_slots or contextlib.nullcontext()):
+            # 자리를 기다리는 동안 예산이 줄었을 수 있으므로 요청 직전에 확인
+            if budget is not None:
+                budget.check()
+            with metrics.timer("discord.fetch_message"):
+                starter_message = await thread.fetch_message(thread.id)
+    except (discord.NotFound, discord.Forbidden):
+        print(f"(경고) 스레드 '{thread.name}'의 시작 메시지를 찾을 수 없습니다.")
+        return None
+
+    # --- 1. Discord 썸네일 (기본값) ---
+    # (Goal 2) 요청: "thumbnail이 discord thread에서 확인 가능할때는 무시"
+    discord_thumbnail = None
+    if starter_message.attachments:
+        for att in starter_message.attachments:
+            if att.content_type and att.content_type.startswith('image/'):
+                discord_thumbnail = att.url
+                break
+
+    # --- 2. content에서 URL 추출 (Goal 1) ---
+    # 모든 링크를 (끝 문장 부호만 떼어 낸 원래 주소로) 꺼낸 뒤 썸네일 탐색에 가장 알맞은 글 링크를 고릅니다.
+    # 내보내는 url은 원래 주소를 쓰고(해시 라우터의 #/post/12 등 유지), 정규화한 주소는
+    # 썸네일 탐색/캐시 키로만 씁니다. (추적 파라미터, fragment 제거)
+    content = starter_message.content
+    links = extract_links(content)
+    extracted_url = pick_article_link(links)
+    article_key = canonicalize_url(extracted_url) if extracted_url else None
+
+    # --- 3. 최종 썸네일 결정 (Goal 2) ---
+    # 요청 없이 알 수 있는 것부터: 첨부 이미지 → 본문의 이미지 링크 → Discord 링크 미리보기
+    final_thumbnail = (
+        discord_thumbnail
+        or next((link for link in links if is_image_link(link)), None)
+        or find_embed_image(starter_message, extracted_url)
+    )
+
+    if not final_thumbnail and extracted_url and budget is not None and not budget.lookups_allowed():
+        # 남은 시간이 부족하면 지난번 썸네일(없으면 썸네일 없이)로 내보내고 다음 실행에서 다시 처리
+        print(f"-> 시간 예산 부족으로 '{thread.name}'의 썸네일 탐색을 미룹니다.")
+        if previous_post and previous_post.get('url') and canonicalize_url(previous_post['url']) == article_key:
+            final_thumbnail = previous_post.get('thumbnail')
+        budget.defer(thread.id)
+        metrics.incr("og_image.deferred")
+    elif not final_thumbnail and extracted_url:
+        # Discord 썸네일이 없고, 추출한 URL이 있다면
+        print(f"-> Discord 썸네일 없음. '{thread.name}'의 썸네일 탐색 시도: {extracted_url}")
+        if og_fetches is not None:
+            og_image = await og_fetches.run(
+                article_key, lambda: get_og_image(session, article_key, og_cache, scheduler)
+            )
+        else:
+            og_image = await get_og_image(session, article_key, og_cache, scheduler)
+        if og_image:
+            final_thumbnail = og_image
+            print(f"  -> 썸네일 찾음: {final_thumbnail}")
+        else:
+            print("  -> 썸네일 없음")
+
+    # --- 4. JSON 데이터 구성 ---
+    post = {
+        "id": thread.id,
+        "title": thread.name,
+        "content": content, # 전체 본문
+        "author": starter_message.author.name,
+        "author_avatar": starter_message.author.display_avatar.url,
+
+        # (Goal 1) 'url' 필드를 Discord URL 대신 추출한 URL(본문에 쓴 원래 주소)로 교체
+        "url": extracted_url,
+
+        # (Goal 2) 최종 썸네일
+        "thumbnail": final_thumbnail,
+
+        "createdAt": thread.created_at.isoformat() if thread.created_at else None,
+    }
+
+    return starter_message, post
+
+
+async def fetch_data(
+    budget: TimeBudget | None = None,
+    discord_client: discord.Client | None = None,
+    output_dir: str = OUTPUT_DIR,
+    cache_dir: str = CACHE_DIR,
+    full_sync: bool = FULL_SYNC,
+    localize_thumbnails: bool = LOCALIZE_THUMBNAILS,
+    rest_only: bool = REST_ONLY,
+):
+    """
+    데이터를 가져와 JSON 파일로 저장하는 메인 로직
+
+    budget이 주어지면 지난 실행에서 미룬 스레드와 최신 스레드부터 처리하고,
+    남은 시간이 마무리 여유만큼 줄면 처리를 멈추고 지금까지의 결과로 내보냅니다.
+    나머지 인자의 기본값은 환경 변수로 정한 설정이며, benchmark.py처럼 다른 클라이언트나
+    출력/캐시 디렉토리로 실행할 때 지정합니다. (discord_client 기본값: 이 모듈의 client)
+    """
+    discord_client = discord_client or client
+    output_file = os.path.join(output_dir, OUTPUT_FILE_NAME)
+
+    # HTML 파서 설정(HTML_PARSER, HTML_PARSE_EXECUTOR, HTML_PARSE_WORKERS)은 Discord 작업 전에 확인합니다.
+    # (잘못된 값이면 ValueError. 썸네일 탐색 중에 처음 만들면 오류가 탐색 실패로 묻힘)
+    parser_backend = resolve_backend()
+    get_executor()
+    print(f"'{discord_client.user}'로 로그인했습니다.")
     
     try:
-        channel = await client.fetch_channel(CHANNEL_ID)
+        with metrics.timer("discord.fetch_channel"):
+            channel = await discord_client.fetch_channel(CHANNEL_ID)
     except (discord.NotFound, discord.Forbidden) as e:
         print(f"❌ 채널(ID: {CHANNEL_ID})을 찾을 수 없거나 접근 권한이 없습니다: {e}", file=sys.stderr)
         return
@@ -80,98 +409,244 @@ async def fetch_data():
 
     print(f"'{channel.name}' 포럼에서 스레드를 가져오는 중...")
     
-    active_threads = channel.threads
-    archived_threads = [thread async for thread in channel.archived_threads(limit=None)]
-    all_threads = active_threads + archived_threads
-    
-    print(f"총 {len(all_threads)}개의 스레드를 찾았습니다.")
-    
-    forum_data = []
+    # 동시에 진행되는 Discord 요청 수를 제한합니다. (오래된 스레드 확인과 시작 메시지 조회에 함께 적용)
+    # Discord 요청의 rate limit 버킷 대기/429 재시도는 discord.py의 HTTP 클라이언트가 처리하므로,
+    # 여기서는 한 번에 몰리는 요청 수만 제한하면 됩니다.
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    # 스냅샷을 불러와 마지막 동기화 이후 바뀐 스레드만 가져옵니다. (full_sync면 전체)
+    snapshot = ForumSnapshot(os.path.join(cache_dir, SNAPSHOT_FILE_NAME))
+    snapshot.load()
+    with metrics.phase("snapshot_sync"):
+        # 최근 글과 지난 실행에서 시간 예산 때문에 미룬 스레드는 아카이브 목록을 그만큼 더 넘겨 다시 가져옵니다.
+        # (스레드는 생성된 뒤에 아카이브되므로 최근 글은 모두 최근 아카이브 목록에 있음)
+        recent_since = datetime.now(timezone.utc) - RECENT_REFRESH_WINDOW
+        deferred_since = snapshot.deferred_archived_since()
+        synced_threads = await sync_forum_snapshot(
+            channel, snapshot, full=full_sync,
+            rescan_after=min(recent_since, deferred_since) if deferred_since else recent_since,
+            rest_only=rest_only,
+        )
+
+        # 목록에서 찾지 못한 미룬 스레드는 개별 조회
+        deferred_ids = {int(thread_id) for thread_id in snapshot.deferred}
+        deferred_records = [
+            snapshot.get(thread_id) for thread_id in deferred_ids
+            if thread_id not in synced_threads and snapshot.get(thread_id)
+        ]
+        if deferred_records:
+            for thread in await resolve_threads(channel, snapshot, deferred_records, synced_threads):
+                synced_threads[thread.id] = thread
+
+        # 오래된 스레드 일부의 삭제 여부 확인 (확인한 스레드는 이번 처리 대상에 포함)
+        synced_threads.update(
+            await verify_stale_records(channel, snapshot, synced_threads, SNAPSHOT_VERIFY_LIMIT, semaphore)
+        )
+
+    # 미룬 스레드 먼저, 그다음 최신 스레드부터 (스레드 id는 생성 순서대로 커지는 snowflake)
+    all_threads = sorted(synced_threads.values(), key=lambda thread: (thread.id not in deferred_ids, -thread.id))
+    if deferred_ids:
+        print(f"⏭️  지난 실행에서 미룬 스레드 {len(deferred_ids)}개를 먼저 처리합니다.")
+    if budget is not None:
+        print(f"⏱️  시간 예산: {budget}, 남은 시간 {budget.remaining():.0f}초")
     
+    print(f"총 {len(all_threads)}개의 스레드를 확인합니다. "
+          f"(Discord 동시 요청: {FETCH_CONCURRENCY}개, 썸네일 동시 요청: {HTTP_CONCURRENCY}개/"
+          f"도메인당 {HTTP_PER_HOST_CONCURRENCY}개{', HTTP/2' if HTTP2_AVAILABLE else ''}, "
+          f"HTML 파서: {parser_backend})")
+
+    reused_count = 0
+
+    og_cache = OGImageCache(os.path.join(cache_dir, OG_CACHE_FILE_NAME))
+    og_cache.load()
+
+    # 썸네일 탐색 요청은 도메인별 상한/백오프를 지키며 도메인끼리 번갈아 진행합니다.
+    scheduler = HostScheduler(per_host=HTTP_PER_HOST_CONCURRENCY, total=HTTP_CONCURRENCY)
+
+    # 여러 글이 같은 링크를 가리키면 썸네일 탐색은 한 번만 요청하고 결과를 나눠 씁니다.
+    og_fetches = SingleFlight()
+
+    # 끝까지 처리한 스레드 (시간 예산 때문에 중단되면 나머지는 다음 실행으로 미룸)
+    finished: set[int] = set()
+
+    async def run_limited(session: httpx.AsyncClient, thread: discord.Thread):
+        nonlocal reused_count
+        record = snapshot.get(thread.id)
+        # 최근 글은 바뀐 것이 없어 보여도 반응 수 갱신을 위해 다시 처리
+        is_recent = thread.created_at is not None and thread.created_at >= recent_since
+        if full_sync or is_recent or thread.id in deferred_ids or not is_thread_unchanged(thread, record):
+            try:
+                previous_post = record['export']['post'] if record and 'export' in record else None
+                result = await process_thread(
+                    session, thread, og_cache, og_fetches, scheduler, semaphore, budget, previous_post
+                )
+            except TimeBudgetExceeded:
+                return
+            except discord.HTTPException as e:
+                # 5xx나 discord.py가 더 기다리지 않은 429 등은 이 스레드만 다음 실행으로 미룸
+                # (예외를 올리면 TaskGroup이 나머지 스레드까지 모두 취소)
+                print(f"(경고) 스레드 '{thread.name}'의 시작 메시지를 가져오지 못해 다음 실행으로 미룹니다: {e}")
+                metrics.incr("threads.failed")
+                return
+            if result is None:
+                # 시작 메시지가 사라진 스레드는 내보내지 않습니다.
+                if record:
+                    record.pop('export', None)
+                finished.add(thread.id)
+                return
+            starter_message, post = result
+            record = snapshot.upsert_thread(thread, starter_message)
+            # 본문은 레코드의 content에만 저장하고 내보낼 때 합칩니다. (export_post)
+            record['export'] = {
+                "last_message_id": thread.last_message_id,
+                "edited_at": record.get('edited_at'),
+                "fetched_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                "post": {key: value for key, value in post.items() if key != 'content'},
+            }
+            post = record['export']['post']
+        else:
+            # 바뀐 것이 없으면 API 호출 없이 이전 결과를 재사용 (제목은 스레드 정보로 갱신)
+            reused_count += 1
+            post = record['export']['post']
+            post['title'] = thread.name
+
+        # 순위 계산용 반응/댓글 수 (댓글은 시작 메시지를 제외한 스레드 메타데이터 값)
+        post['likes'] = record.get('reaction_count', 0)
+        post['comments'] = getattr(thread, 'message_count', None) or 0
+        finished.add(thread.id)
+
     # (Goal 2) HTTP 요청을 위한 비동기 클라이언트 세션 생성
-    async with httpx.AsyncClient(headers=HEADERS) as session:
-        for thread in all_threads:
+    # (도메인별 연결 풀 재사용, h2가 설치되어 있으면 HTTP/2)
+    with metrics.phase("process_threads"):
+        async with create_http_client(HEADERS, HTTP_CONCURRENCY) as session:
             try:
-                starter_message = await thread.fetch_message(thread.id)
-            except (discord.NotFound, discord.Forbidden):
-                print(f"(경고) 스레드 '{thread.name}'의 시작 메시지를 찾을 수 없습니다.")
-                continue
-            
-            # --- 1. Discord 썸네일 (기본값) ---
-            # (Goal 2) 요청: "thumbnail이 discord thread에서 확인 가능할때는 무시"
-            discord_thumbnail = None
-            if starter_message.attachments:
-                for att in starter_message.attachments:
-                    if att.content_type and att.content_type.startswith('image/'):
-                        discord_thumbnail = att.url
-                        break
-            
-            # --- 2. content에서 URL 추출 (Goal 1) ---
-            content = starter_message.content
-            extracted_url = None
-            
-            # 정규식을 사용해 content에서 첫 번째 http/https URL을 찾습니다.
-            url_match = re.search(r"https?://[^\s]+", content)
-            if url_match:
-                extracted_url = url_match.group(0)
-
-            # --- 3. 최종 썸네일 결정 (Goal 2) ---
-            final_thumbnail = discord_thumbnail # 일단 Discord 썸네일로 설정
-
-            if not final_thumbnail and extracted_url:
-                # Discord 썸네일이 없고, 추출한 URL이 있다면
-                print(f"-> Discord 썸네일 없음. '{thread.name}'의 썸네일 탐색 시도: {extracted_url}")
-                og_image = await get_og_image(session, extracted_url)
-                if og_image:
-                    final_thumbnail = og_image
-                    print(f"  -> 썸네일 찾음: {final_thumbnail}")
-                else:
-                    print("  -> 썸네일 없음")
-            
-            # --- 4. JSON 데이터 구성 ---
-            forum_data.append({
-                "id": thread.id,
-                "title": thread.name,
-                "content": content, # 전체 본문
-                "author": starter_message.author.name,
-                "author_avatar": starter_message.author.display_avatar.url,
-                
-                # (Goal 1) 'url' 필드를 Discord URL 대신 추출한 URL로 교체
-                "url": extracted_url, 
-                
-                # (Goal 2) 최종 썸네일
-                "thumbnail": final_thumbnail, 
-                
-                "createdAt": thread.created_at.isoformat() if thread.created_at else None,
-            })
-
-    # 3. JSON 파일로 저장
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(forum_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ 데이터가 {OUTPUT_FILE}에 성공적으로 저장되었습니다.")
+                # 마무리 여유만 남으면 진행 중인 요청도 모두 중단합니다. (예산이 없으면 제한 없음)
+                async with asyncio.timeout(budget.processing_remaining() if budget else None):
+                    # TaskGroup은 하나라도 실패하면 나머지 작업을 취소합니다.
+                    async with asyncio.TaskGroup() as tg:
+                        for thread in all_threads:
+                            tg.create_task(run_limited(session, thread))
+            except TimeoutError:
+                print("⏱️  시간 예산을 모두 써서 남은 스레드 처리를 중단합니다.")
+            finally:
+                # 기다리던 스레드가 모두 중단되어 남은 썸네일 탐색 작업 정리
+                og_fetches.cancel_pending()
+
+    # 처리하지 못한 스레드와 썸네일 탐색을 건너뛴 스레드는 다음 실행에서 먼저 처리합니다.
+    # (이전에 내보낸 결과가 있으면 이번 내보내기에는 그 결과를 사용)
+    deferred = {thread.id for thread in all_threads if thread.id not in finished}
+    if budget is not None:
+        deferred |= budget.deferred
+    snapshot.deferred = [str(thread_id) for thread_id in sorted(deferred, reverse=True)]
+
+    # 이번에 확인하지 않은 (더 오래전에 아카이브된) 스레드도 스냅샷에 저장된 결과로 포함합니다.
+    # 완료 순서와 상관없이 항상 최신 글부터 같은 순서로 저장됩니다.
+    forum_data = [export_post(record) for record in snapshot.threads.values() if record.get('export')]
+    forum_data.sort(key=lambda post: (post['createdAt'] or '', post['id']), reverse=True)
+
+    metrics.incr("threads.processed", len(finished) - reused_count)
+    metrics.incr("threads.reused", reused_count)
+    metrics.incr("og_image.fetches", og_fetches.started)
+    metrics.incr("og_image.coalesced", og_fetches.coalesced)
+    metrics.incr("threads.deferred", len(deferred))
+    print(f"새로 처리: {len(finished) - reused_count}개, 이전 결과 재사용: {reused_count}개, "
+          f"내보낸 글: {len(forum_data)}개")
+    if deferred:
+        print(f"⏭️  다음 실행으로 미룬 스레드: {len(deferred)}개")
+
+    # 썸네일 원본 대신 로컬 축소본 사용 (스냅샷의 글은 원본 URL을 그대로 유지)
+    if localize_thumbnails:
+        thumbnail_store = ThumbnailStore(
+            THUMBNAIL_DIR or os.path.join(output_dir, 'thumbs'),
+            os.path.join(cache_dir, THUMBNAIL_CACHE_FILE_NAME),
+            base_url=THUMBNAIL_BASE_URL,
+            download_concurrency=THUMBNAIL_CONCURRENCY,
+        )
+        thumbnail_store.load()
+        with metrics.phase("thumbnails"):
+            async with httpx.AsyncClient(headers=HEADERS) as session:
+                # 시간이 부족하면 이미 만든 축소본만 사용
+                forum_data = await thumbnail_store.localize_posts(
+                    session, forum_data, allow_downloads=budget is None or budget.lookups_allowed()
+                )
+        thumbnail_store.save()
+        print(f"🖼️  {thumbnail_store.summary()}")
+
+    with metrics.phase("export"):
+        # 3. JSON 파일로 저장
+        write_json(output_file, forum_data, compact=EXPORT_COMPACT)
+
+        print(f"✅ 데이터가 {output_file}에 성공적으로 저장되었습니다.")
+
+        # 프론트엔드가 나눠 불러올 인덱스/페이지/글별 파일
+        export_dir = write_sharded_export(forum_data, output_dir, compact=EXPORT_COMPACT)
+        print(f"✅ 분할 내보내기 완료: {export_dir}")
+
+        # 카드 미리보기/검색용 요약 (발췌, 읽기 시간, 검색 토큰)과 검색 역색인
+        digests = [build_digest(post) for post in forum_data]
+        digest_file = write_digest_index(digests, output_dir, compact=EXPORT_COMPACT)
+        print(f"✅ 글 요약 인덱스 저장: {digest_file}")
+        search_index_file = write_search_index(digests, output_dir)
+        print(f"✅ 검색 역색인 저장: {search_index_file}")
+
+        # 탭 전환 시 정렬하지 않도록 미리 정렬한 트렌딩/최신/작성자별 id 목록
+        rankings_file = write_rankings(forum_data, output_dir, compact=EXPORT_COMPACT)
+        print(f"✅ 정렬 목록 저장: {rankings_file}")
+
+        if EXPORT_COMPACT:
+            compact_file = write_compact_posts(forum_data, output_dir)
+            # 절감률 비교 기준: 기존 들여쓰기 형식의 forum-posts.json 크기
+            pretty_size = len(json.dumps(forum_data, ensure_ascii=False, indent=2).encode('utf-8'))
+            print("📦 압축 내보내기:")
+            precompress_and_report(
+                [output_file, compact_file, export_dir],
+                {output_file: pretty_size, compact_file: pretty_size},
+            )
+
+    # 다음 실행의 증분 동기화를 위해 스냅샷 저장
+    snapshot.save()
+    og_cache.save()
+    print(f"📊 {og_cache.summary()}")
+    metrics.incr("og_cache.hit", og_cache.hits)
+    metrics.incr("og_cache.negative_hit", og_cache.negative_hits)
+    metrics.incr("og_cache.miss", og_cache.misses)
+    metrics.incr("og_cache.revalidated", og_cache.revalidated)
 
 
 @client.event
 async def on_ready():
     try:
-        await fetch_data()
+        await fetch_data(time_budget)
     except Exception as e:
         print(f"❌ 스크립트 실행 중 치명적인 오류 발생: {e}", file=sys.stderr)
         sys.exit(1)
     finally:
+        shutdown_executor()
+        metrics.emit("fetch_forum_data")
         print("작업 완료. 봇을 종료합니다.")
         await client.close()
 
 # --- 메인 실행 ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Discord 포럼 글을 JSON 파일로 내보냅니다.")
+    parser.add_argument(
+        "--time-budget", type=float, default=TIME_BUDGET_SECONDS, metavar="SECONDS",
+        help="실행 시간 예산(초). 넘기 전에 처리한 만큼만 내보내고 나머지는 다음 실행으로 미룸 (기본: TIME_BUDGET_SECONDS, 0이면 제한 없음)",
+    )
+    args = parser.parse_args()
+    if args.time_budget > 0:
+        time_budget = TimeBudget(args.time_budget)
+
     if not TOKEN or CHANNEL_ID == 0:
         print("❌ 환경 변수 DISCORD_TOKEN 또는 FORUM_CHANNEL_ID가 설정되지 않았습니다.", file=sys.stderr)
         sys.exit(1)
     
     try:
-        client.run(TOKEN)
+        if REST_ONLY:
+            # 게이트웨이 연결 없이 로그인 후 바로 실행 (채널/스레드/메시지 모두 REST로 조회)
+            asyncio.run(run_rest_only(client, TOKEN, on_ready))
+        else:
+            client.run(TOKEN)
     except discord.errors.LoginFailure:
         print("❌ Discord 로그인 실패. 토큰이 올바른지 확인하세요.", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,261 @@
+"""
+포럼 글 정적 내보내기
+
+fetch_forum_data.py가 만든 글 목록(최신 글 순)을 프론트엔드가 나눠서 불러올 수 있도록
+작은 인덱스 파일과 페이지/월별 목록 조각, 글별 본문 파일로 나누어 저장합니다.
+
+    forum/index.json           전체 글 수, 페이지/월별 조각 목록
+    forum/pages/{n}.json       n번째 페이지 글 요약 (본문 제외)
+    forum/months/{yyyy-mm}.json 해당 월 글 요약 (본문 제외)
+    forum/posts/{id}.json      글 전체 (본문 포함, 필요할 때만 요청)
+    forum/digest.json          글별 발췌/읽기 시간/검색 토큰
+    forum/search-index.json    검색 토큰 → 글 목록 역색인
+    forum/rankings.json        트렌딩/최신/작성자별로 미리 정렬한 글 id 목록
+
+compact 모드에서는 모든 JSON을 공백 없이 저장하고, 작성자 정보를 한 번만 담은
+forum-posts.min.json을 추가로 만들며, 각 파일 옆에 .gz/.br 사전 압축본을 둡니다.
+
+Discord 스레드 id는 JavaScript number로 정확히 표현할 수 없는 크기이므로
+이 파일들에서는 id를 문자열로 저장합니다. (파일 경로와 정확히 일치하도록)
+"""
+
+import gzip
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+from ranking import build_rankings
+from search_index import build_search_index
+
+try:
+    import brotli  # 선택 의존성: 설치되어 있을 때만 .br 생성
+except ImportError:
+    brotli = None
+
+# 내보내기 디렉토리 이름 (OUTPUT_DIR 아래)
+EXPORT_DIR_NAME = "forum"
+
+# 작성자 정보를 분리한 압축 목록 파일 이름 (OUTPUT_DIR 아래)
+COMPACT_POSTS_FILE_NAME = "forum-posts.min.json"
+
+# 페이지당 글 수
+DEFAULT_PAGE_SIZE = 20
+
+# 목록 조각에 포함할 필드 (카드 렌더링에 필요한 것만, 본문 제외)
+SUMMARY_FIELDS = ("id", "title", "author", "author_avatar", "url", "thumbnail", "thumbnailWebp", "createdAt", "likes", "comments")
+
+
+def summarize_post(post: dict) -> dict:
+    """목록용 글 요약 (본문 제외, id는 문자열)"""
+    summary = {field: post.get(field) for field in SUMMARY_FIELDS}
+    summary["id"] = str(post["id"])
+    return summary
+
+
+def write_json(path: str, data, compact: bool = False):
+    """JSON 파일 저장 (compact면 공백 없이)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        if compact:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def write_sharded_export(
+    posts: List[dict],
+    output_dir: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    compact: bool = False
+) -> str:
+    """
+    글 목록을 인덱스/페이지/월별/글별 파일로 나누어 저장
+
+    지워진 글이나 줄어든 페이지 파일이 남지 않도록 내보내기 디렉토리를 새로 만듭니다.
+
+    Args:
+        posts: 최신 글 순으로 정렬된 글 목록
+        output_dir: 출력 디렉토리 (public)
+        page_size: 페이지당 글 수
+        compact: True면 공백 없이 저장
+
+    Returns:
+        str: 내보내기 디렉토리 경로
+    """
+    export_dir = os.path.join(output_dir, EXPORT_DIR_NAME)
+    shutil.rmtree(export_dir, ignore_errors=True)
+
+    summaries = [summarize_post(post) for post in posts]
+
+    # 페이지 조각
+    pages = []
+    for page_number, start in enumerate(range(0, len(summaries), page_size), 1):
+        page_file = f"pages/{page_number}.json"
+        write_json(os.path.join(export_dir, page_file), summaries[start:start + page_size], compact)
+        pages.append(page_file)
+
+    # 월별 조각 (createdAt의 yyyy-mm 기준, 최신 월부터)
+    months: Dict[str, List[dict]] = {}
+    for summary in summaries:
+        month = (summary["createdAt"] or "unknown")[:7]
+        months.setdefault(month, []).append(summary)
+
+    month_entries = []
+    for month, month_summaries in months.items():
+        month_file = f"months/{month}.json"
+        write_json(os.path.join(export_dir, month_file), month_summaries, compact)
+        month_entries.append({"month": month, "count": len(month_summaries), "file": month_file})
+
+    # 글별 본문
+    for post in posts:
+        write_json(os.path.join(export_dir, "posts", f"{post['id']}.json"), {**post, "id": str(post["id"])}, compact)
+
+    write_json(os.path.join(export_dir, "index.json"), {
+        "total": len(posts),
+        "pageSize": page_size,
+        "pages": pages,
+        "months": month_entries,
+        "postPath": "posts/{id}.json",
+    }, compact)
+
+    return export_dir
+
+
+def write_digest_index(digests: List[dict], output_dir: str, compact: bool = False) -> str:
+    """
+    글별 발췌, 글자/단어 수, 읽기 시간, 검색 토큰(text_digest.build_digest 결과)을 모은
+    digest.json 저장 (write_sharded_export 이후에 호출)
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    path = os.path.join(output_dir, EXPORT_DIR_NAME, "digest.json")
+    write_json(path, {"posts": digests}, compact)
+    return path
+
+
+def write_search_index(digests: List[dict], output_dir: str) -> str:
+    """
+    검색 토큰 역색인 search-index.json 저장 (write_sharded_export 이후에 호출)
+    크기가 글 수에 비례해 커지므로 항상 공백 없이 저장합니다.
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    path = os.path.join(output_dir, EXPORT_DIR_NAME, "search-index.json")
+    write_json(path, build_search_index(digests), compact=True)
+    return path
+
+
+def write_rankings(posts: List[dict], output_dir: str, compact: bool = False) -> str:
+    """
+    트렌딩(시간 감쇠 적용 HOT 스코어)/최신/작성자별로 정렬한 글 id 목록
+    rankings.json 저장 (write_sharded_export 이후에 호출)
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    path = os.path.join(output_dir, EXPORT_DIR_NAME, "rankings.json")
+    write_json(path, build_rankings(posts), compact)
+    return path
+
+
+def write_compact_posts(posts: List[dict], output_dir: str) -> str:
+    """
+    작성자 이름/아바타를 authors 표로 분리하고 글에는 표의 위치만 남긴 목록 저장
+
+        {"authors": [{"name": ..., "avatar": ...}], "posts": [{..., "author": 0}]}
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    authors: List[dict] = []
+    author_indexes: Dict[Tuple[str, str], int] = {}
+    compact_posts = []
+    for post in posts:
+        key = (post["author"], post["author_avatar"])
+        if key not in author_indexes:
+            author_indexes[key] = len(authors)
+            authors.append({"name": post["author"], "avatar": post["author_avatar"]})
+
+        compact_post = {field: value for field, value in post.items() if field != "author_avatar"}
+        compact_post["id"] = str(post["id"])
+        compact_post["author"] = author_indexes[key]
+        compact_posts.append(compact_post)
+
+    path = os.path.join(output_dir, COMPACT_POSTS_FILE_NAME)
+    write_json(path, {"authors": authors, "posts": compact_posts}, compact=True)
+    return path
+
+
+def precompress(path: str) -> Tuple[int, int, Optional[int]]:
+    """
+    파일 옆에 .gz (brotli가 설치되어 있으면 .br도) 사전 압축본 생성
+
+    gzip 헤더의 시간은 0으로 고정해 내용이 같으면 압축본도 같게 만듭니다.
+    (변경이 없을 때 워크플로우가 커밋하지 않도록)
+
+    Returns:
+        Tuple[int, int, Optional[int]]: (원본 크기, gzip 크기, brotli 크기 또는 None)
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    gz_data = gzip.compress(raw, compresslevel=9, mtime=0)
+    with open(path + ".gz", "wb") as f:
+        f.write(gz_data)
+
+    br_size = None
+    if brotli is not None:
+        br_data = brotli.compress(raw, quality=11)
+        with open(path + ".br", "wb") as f:
+            f.write(br_data)
+        br_size = len(br_data)
+
+    return len(raw), len(gz_data), br_size
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024:.1f}KB"
+
+
+def precompress_and_report(paths: List[str], baseline_sizes: Optional[Dict[str, int]] = None):
+    """
+    파일/디렉토리 목록의 JSON을 사전 압축하고 크기 절감을 출력
+
+    Args:
+        paths: 파일 또는 디렉토리 경로 (디렉토리는 안의 .json을 모두 합산해 한 줄로 출력)
+        baseline_sizes: 경로별 비교 기준 크기 (예: 들여쓰기 JSON 크기)
+    """
+    baseline_sizes = baseline_sizes or {}
+    if brotli is None:
+        print("   (brotli 모듈이 없어 .br 파일은 만들지 않습니다. pip install brotli)")
+
+    for path in paths:
+        if os.path.isdir(path):
+            files = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names if name.endswith(".json")
+            ]
+        else:
+            files = [path]
+
+        raw_total, gz_total, br_total = 0, 0, 0
+        for file in files:
+            raw, gz_size, br_size = precompress(file)
+            raw_total += raw
+            gz_total += gz_size
+            br_total += br_size or 0
+
+        label = os.path.basename(path.rstrip(os.sep)) + (f"/ ({len(files)}개 파일)" if os.path.isdir(path) else "")
+        baseline = baseline_sizes.get(path)
+        line = f"   📦 {label}: {_format_size(raw_total)}"
+        if baseline:
+            line += f" (들여쓰기 대비 -{(1 - raw_total / baseline) * 100:.0f}%)"
+        if raw_total:
+            line += f", gzip {_format_size(gz_total)} (-{(1 - gz_total / raw_total) * 100:.0f}%)"
+            if brotli is not None:
+                line += f", brotli {_format_size(br_total)} (-{(1 - br_total / raw_total) * 100:.0f}%)"
+        print(line)
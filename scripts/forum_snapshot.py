@@ -0,0 +1,404 @@
+"""
+포럼 스레드 스냅샷 저장소
+
+fetch_forum_data.py, weekly_check.py, weekly_dm_reminder.py가 함께 사용하는
+로컬 스레드 인덱스입니다. 스레드 메타데이터(작성자, 생성 시각, 아카이브 여부,
+메시지/반응 수, 시작 메시지 본문)를 JSON 파일 하나에 저장하고,
+매 실행마다 전체 아카이브를 다시 훑는 대신 마지막 동기화 이후에
+아카이브된 스레드만 가져와 갱신합니다.
+"""
+
+import asyncio
+import contextlib
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+import discord
+
+from discord_rest import REST_ONLY
+from json_store import atomic_write_json, load_json
+from metrics import metrics
+
+SNAPSHOT_VERSION = 1
+
+# 기본 스냅샷 파일 (fetch_forum_data 워크플로우가 커밋)
+DEFAULT_SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "forum-snapshot.json")
+
+# 아카이브 목록을 어디까지 넘길지 정할 때 기준 시각보다 이만큼 더 과거까지 확인
+# (시계 오차나 늦게 아카이브 상태가 반영되는 경우 대비, ARCHIVE_GRACE_HOURS로 조정)
+try:
+    ARCHIVE_SYNC_GRACE = timedelta(hours=max(0.0, float(os.environ.get("ARCHIVE_GRACE_HOURS", "1"))))
+except ValueError:
+    print("❌ ARCHIVE_GRACE_HOURS가 올바른 숫자 형식이 아닙니다.", file=sys.stderr)
+    sys.exit(1)
+
+# Discord는 2022-07-01 이전에 만들어진 스레드의 message_count를 50에서 더 세지 않음
+MESSAGE_COUNT_RELIABLE_SINCE = datetime(2022, 7, 1, tzinfo=timezone.utc)
+MESSAGE_COUNT_LEGACY_CAP = 50
+
+
+def _to_utc(value: datetime) -> datetime:
+    """naive datetime은 UTC로 간주해 aware datetime으로 변환"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return _to_utc(value).isoformat() if value else None
+
+
+class ForumSnapshot:
+    """스레드 id(문자열)를 키로 하는 포럼 스레드 스냅샷"""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_FILE):
+        self.path = path
+        self.threads: Dict[str, dict] = {}
+        self.synced_at: Optional[datetime] = None
+        # 시간 예산 때문에 지난 실행에서 처리하지 못한 스레드 id (다음 실행에서 먼저 처리)
+        self.deferred: List[str] = []
+        # 삭제 여부를 돌아가며 확인할 때 마지막으로 확인한 스레드 id (verify_stale_records)
+        self.verify_cursor: Optional[str] = None
+
+    def load(self):
+        """스냅샷 파일 읽기 (형식 버전이 다르면 빈 스냅샷)"""
+        data = load_json(self.path, None, "스냅샷")
+        if data is None:
+            return
+        if data.get("version") != SNAPSHOT_VERSION:
+            print("⚠️  스냅샷 파일 버전이 달라 새로 만듭니다.", file=sys.stderr)
+            return
+
+        self.threads = data.get("threads", {})
+        for record in self.threads.values():
+            # 이전 형식은 내보낼 글에도 본문을 중복 저장했음 (지금은 레코드의 content 하나만 사용)
+            record.get("export", {}).get("post", {}).pop("content", None)
+        synced_at = data.get("synced_at")
+        self.synced_at = datetime.fromisoformat(synced_at) if synced_at else None
+        self.deferred = [str(thread_id) for thread_id in data.get("deferred", [])]
+        self.verify_cursor = data.get("verify_cursor")
+
+    def save(self):
+        """동기화 시각, 미룬 스레드, 스레드 레코드 저장"""
+        atomic_write_json(self.path, {
+            "version": SNAPSHOT_VERSION,
+            "synced_at": _isoformat(self.synced_at),
+            "deferred": self.deferred,
+            "verify_cursor": self.verify_cursor,
+            "threads": self.threads,
+        })
+
+    def get(self, thread_id: int) -> Optional[dict]:
+        return self.threads.get(str(thread_id))
+
+    def remove(self, thread_id: int):
+        self.threads.pop(str(thread_id), None)
+
+    def upsert_thread(
+        self,
+        thread: discord.Thread,
+        starter_message: Optional[discord.Message] = None,
+        message_count: Optional[int] = None,
+    ) -> dict:
+        """
+        스레드 메타데이터를 저장하고 해당 레코드를 반환
+
+        Args:
+            thread: Discord 스레드
+            starter_message: 시작 메시지 (주어지면 본문/반응 수/수정 시각 갱신)
+            message_count: 메시지 수 (주어지면 갱신)
+
+        Returns:
+            dict: 갱신된 스냅샷 레코드
+        """
+        record = self.threads.setdefault(str(thread.id), {"id": thread.id})
+        record.update({
+            "guild_id": thread.guild.id,
+            "title": thread.name,
+            "owner_id": thread.owner_id,
+            "created_at": _isoformat(thread.created_at),
+            "archived": thread.archived,
+            "archive_timestamp": _isoformat(thread.archive_timestamp),
+            "last_message_id": thread.last_message_id,
+        })
+        if thread.owner:
+            record["owner_name"] = thread.owner.name
+
+        if starter_message is not None:
+            record["owner_name"] = starter_message.author.name
+            record["content"] = starter_message.content
+            record["edited_at"] = _isoformat(starter_message.edited_at)
+            record["reaction_count"] = sum(reaction.count for reaction in starter_message.reactions)
+
+        if message_count is not None:
+            record["message_count"] = message_count
+            # 이 개수를 센 시점의 마지막 메시지 (다음 실행에서 캐시 유효성 판단에 사용)
+            record["message_count_last_message_id"] = thread.last_message_id
+
+        return record
+
+    def cached_message_count(self, thread: discord.Thread) -> Optional[int]:
+        """마지막으로 센 이후 새 메시지가 없으면 저장된 메시지 수 반환"""
+        record = self.get(thread.id)
+        if not record or record.get("message_count") is None:
+            return None
+        if record.get("message_count_last_message_id") != thread.last_message_id:
+            return None
+        return record["message_count"]
+
+    def deferred_archived_since(self) -> Optional[datetime]:
+        """미룬 스레드 중 아카이브된 것의 가장 이른 아카이브 시각 (다시 가져올 아카이브 목록 범위)"""
+        timestamps = []
+        for thread_id in self.deferred:
+            record = self.threads.get(thread_id)
+            if record and record.get("archived") and record.get("archive_timestamp"):
+                timestamps.append(datetime.fromisoformat(record["archive_timestamp"]))
+        return min(timestamps, default=None)
+
+    def threads_between(self, start_date: datetime, end_date: datetime) -> List[dict]:
+        """생성 시각이 [start_date, end_date] 범위인 레코드를 생성 시각 순으로 반환"""
+        start_date, end_date = _to_utc(start_date), _to_utc(end_date)
+        records = []
+        for record in self.threads.values():
+            created_at = record.get("created_at")
+            if created_at and start_date <= datetime.fromisoformat(created_at) <= end_date:
+                records.append(record)
+        return sorted(records, key=lambda record: record["created_at"])
+
+
+async def list_active_threads(
+    forum_channel: discord.ForumChannel,
+    rest_only: bool = REST_ONLY
+) -> List[discord.Thread]:
+    """
+    포럼의 활성(아카이브되지 않은) 스레드
+
+    게이트웨이로 서버 정보를 받았으면 캐시(forum_channel.threads)를 그대로 쓰고,
+    REST 전용 실행(rest_only)이면 서버의 활성 스레드 목록을 한 번 조회해 이 포럼의 스레드만 고릅니다.
+    """
+    if not rest_only:
+        return list(forum_channel.threads)
+    with metrics.timer("discord.active_threads"):
+        threads = await forum_channel.guild.active_threads()
+    return [thread for thread in threads if thread.parent_id == forum_channel.id]
+
+
+async def iter_archived_threads(
+    forum_channel: discord.ForumChannel,
+    archived_after: Optional[datetime] = None
+) -> AsyncIterator[discord.Thread]:
+    """
+    아카이브된 스레드를 최근 아카이브 순으로 가져옴
+
+    페이지 넘기기는 discord.py의 archived_threads(limit=None)에 맡기고,
+    archived_after보다 먼저 아카이브된 스레드를 만나면 다음 페이지를 요청하지 않고 멈춥니다.
+
+    Args:
+        forum_channel: Discord 포럼 채널
+        archived_after: 이 시각 이후에 아카이브된 스레드만 가져옴 (None이면 전체)
+    """
+    async with contextlib.aclosing(forum_channel.archived_threads(limit=None)) as archived:
+        async for thread in archived:
+            if archived_after and thread.archive_timestamp and _to_utc(thread.archive_timestamp) < archived_after:
+                break
+            metrics.incr("discord.archived_threads")
+            yield thread
+
+
+def _in_listed_range(record: dict, cutoff: Optional[datetime], complete: bool) -> bool:
+    """이번 동기화에서 훑은 범위(활성 목록 + cutoff 이후 아카이브 목록)에 있어야 하는 레코드인지"""
+    if cutoff is None:
+        return True
+    if not record.get("archived"):
+        # 지난 동기화 때 활성이었으면 지금은 활성 목록이나 그 이후 아카이브 목록에 있어야 함
+        # (기간 한정 동기화는 지난 동기화 시각까지 훑지 않으므로 판단하지 않음)
+        return complete
+    archive_timestamp = record.get("archive_timestamp")
+    return bool(archive_timestamp) and datetime.fromisoformat(archive_timestamp) >= cutoff
+
+
+async def sync_forum_snapshot(
+    forum_channel: discord.ForumChannel,
+    snapshot: ForumSnapshot,
+    full: bool = False,
+    not_before: Optional[datetime] = None,
+    rescan_after: Optional[datetime] = None,
+    rest_only: bool = REST_ONLY
+) -> Dict[int, discord.Thread]:
+    """
+    활성 스레드와 마지막 동기화 이후 아카이브된 스레드로 스냅샷을 갱신
+
+    아카이브 목록은 최근 아카이브 순으로 오므로, 마지막 동기화 시각(- 여유 시간)보다
+    먼저 아카이브된 스레드를 만나면 더 이상 페이지를 넘기지 않습니다.
+    새 스레드나 댓글이 달린 스레드는 다시 활성화/아카이브되며 시각이 갱신되므로 놓치지 않습니다.
+    훑은 범위에 있어야 하는데 보이지 않은 스레드는 삭제된 것으로 보고 스냅샷에서 제거합니다.
+    (그보다 오래전에 아카이브된 스레드의 삭제는 verify_stale_records로 확인)
+
+    Args:
+        forum_channel: Discord 포럼 채널
+        snapshot: 갱신할 스냅샷
+        full: True면 증분 동기화 시각을 무시하고 전체 아카이브를 훑음
+        not_before: 이 시각 이후에 생성된 스레드만 필요한 경우 지정.
+            스레드는 생성된 뒤에 아카이브되므로, 스냅샷이 없거나 오래되었어도
+            이 시각(- 여유 시간)보다 먼저 아카이브된 스레드는 가져오지 않습니다.
+        rescan_after: 마지막 동기화 시각과 상관없이 이 시각 이후에 아카이브된 스레드를 다시 가져옴
+            (지난 실행에서 처리를 미룬 스레드를 개별 조회 대신 목록 몇 페이지로 다시 얻을 때 사용)
+        rest_only: True면 활성 스레드를 캐시 대신 REST로 조회 (기본: DISCORD_REST_ONLY)
+
+    Returns:
+        Dict[int, discord.Thread]: 이번에 가져온 스레드 (id → 스레드)
+    """
+    sync_started_at = datetime.now(timezone.utc)
+    cutoff = None
+    if not full and snapshot.synced_at:
+        cutoff = snapshot.synced_at - ARCHIVE_SYNC_GRACE
+
+    # 조회 기간으로 더 일찍 멈출 수 있으면 그 시각까지만 확인합니다.
+    # 이 경우 스냅샷에 빈 구간이 생기므로 동기화 시각은 갱신하지 않습니다.
+    complete = True
+    if not full and not_before is not None:
+        window_cutoff = _to_utc(not_before) - ARCHIVE_SYNC_GRACE
+        if cutoff is None or window_cutoff > cutoff:
+            cutoff = window_cutoff
+            complete = False
+    if not full and rescan_after is not None and cutoff is not None:
+        cutoff = min(cutoff, _to_utc(rescan_after) - ARCHIVE_SYNC_GRACE)
+
+    seen: Dict[int, discord.Thread] = {}
+
+    # 활성 스레드
+    for thread in await list_active_threads(forum_channel, rest_only):
+        seen[thread.id] = thread
+
+    # 아카이브된 스레드 (cutoff 이전 것은 이미 스냅샷에 있거나 필요 없음)
+    async for thread in iter_archived_threads(forum_channel, cutoff):
+        seen[thread.id] = thread
+
+    for thread in seen.values():
+        snapshot.upsert_thread(thread)
+
+    removed = 0
+    for thread_id, record in list(snapshot.threads.items()):
+        if int(thread_id) not in seen and _in_listed_range(record, cutoff, complete):
+            snapshot.remove(int(thread_id))
+            removed += 1
+
+    if complete:
+        snapshot.synced_at = sync_started_at
+    mode = "전체" if cutoff is None else "증분" if complete else "기간 한정"
+    print(f"   🗂️  스냅샷 {mode} 동기화: {len(seen)}개 스레드 갱신, {removed}개 삭제, "
+          f"총 {len(snapshot.threads)}개 보관")
+    return seen
+
+
+async def verify_stale_records(
+    forum_channel: discord.ForumChannel,
+    snapshot: ForumSnapshot,
+    known_threads: Dict[int, discord.Thread],
+    limit: int,
+    discord_slots: Optional[asyncio.Semaphore] = None
+) -> Dict[int, discord.Thread]:
+    """
+    이번 동기화에서 보지 못한 레코드 중 최대 limit개를 돌아가며 개별 조회해 삭제 여부 확인
+
+    증분 동기화는 오래전에 아카이브된 스레드를 다시 훑지 않으므로, 실행마다 id 순으로
+    이어서(verify_cursor) 조금씩 확인하고 삭제된 스레드는 스냅샷에서 제거합니다.
+    discord_slots가 주어지면 조회마다 자리를 받아 다른 Discord 요청과 같은 동시 요청 수 제한을 따릅니다.
+
+    Returns:
+        Dict[int, discord.Thread]: 조회에 성공한 스레드 (id → 스레드)
+    """
+    stale_ids = sorted(int(thread_id) for thread_id in snapshot.threads if int(thread_id) not in known_threads)
+    if limit <= 0 or not stale_ids:
+        return {}
+
+    cursor = int(snapshot.verify_cursor or 0)
+    start = next((i for i, thread_id in enumerate(stale_ids) if thread_id > cursor), 0)
+    batch = (stale_ids[start:] + stale_ids[:start])[:limit]
+
+    async def fetch(thread_id: int) -> Optional[discord.Thread]:
+        try:
+            async with (discord_slots or contextlib.nullcontext()):
+                with metrics.timer("discord.fetch_channel"):
+                    return await forum_channel.guild.fetch_channel(thread_id)
+        except discord.NotFound:
+            snapshot.remove(thread_id)
+        except discord.Forbidden:
+            pass
+        return None
+
+    threads = await asyncio.gather(*(fetch(thread_id) for thread_id in batch))
+    snapshot.verify_cursor = str(batch[-1])
+
+    verified = {thread.id: thread for thread in threads if thread is not None}
+    for thread in verified.values():
+        snapshot.upsert_thread(thread)
+    print(f"   🔎 오래된 스레드 {len(batch)}개 확인: {len(batch) - len(verified)}개 삭제/접근 불가")
+    return verified
+
+
+async def count_thread_messages(thread: discord.Thread, snapshot: Optional[ForumSnapshot] = None) -> int:
+    """
+    스레드의 메시지 수 (시작 메시지 포함)
+
+    1. Discord 스레드 메타데이터(message_count)를 사용 (API 호출 없음)
+    2. 메타데이터가 없거나 믿을 수 없으면 스냅샷에 캐시된 개수 사용
+    3. 그래도 없으면 history를 끝까지 훑어서 셈 (100개당 1회 요청)
+    """
+    metadata_count = getattr(thread, "message_count", None)
+    created_at = _to_utc(thread.created_at) if thread.created_at else None
+    legacy_capped = (
+        metadata_count is not None
+        and metadata_count >= MESSAGE_COUNT_LEGACY_CAP
+        and (created_at is None or created_at < MESSAGE_COUNT_RELIABLE_SINCE)
+    )
+    if metadata_count is not None and not legacy_capped:
+        # message_count는 시작 메시지를 포함하지 않음
+        metrics.incr("message_count.metadata")
+        return metadata_count + 1
+
+    if snapshot is not None:
+        cached_count = snapshot.cached_message_count(thread)
+        if cached_count is not None:
+            metrics.incr("message_count.cached")
+            return cached_count
+
+    metrics.incr("message_count.history")
+    message_count = 0
+    with metrics.timer("discord.thread_history"):
+        async for _ in thread.history(limit=None):
+            message_count += 1
+    metrics.incr("discord.thread_history.messages", message_count)
+    return message_count
+
+
+async def resolve_threads(
+    forum_channel: discord.ForumChannel,
+    snapshot: ForumSnapshot,
+    records: List[dict],
+    known_threads: Dict[int, discord.Thread]
+) -> List[discord.Thread]:
+    """
+    스냅샷 레코드에 해당하는 스레드 객체를 가져옴
+
+    이번 동기화에서 이미 가져온 스레드는 그대로 쓰고, 나머지만 개별 조회합니다.
+    삭제된 스레드는 스냅샷에서 제거합니다.
+    """
+    threads = []
+    for record in records:
+        thread_id = record["id"]
+        thread = known_threads.get(thread_id) or forum_channel.guild.get_thread(thread_id)
+        if thread is None:
+            try:
+                with metrics.timer("discord.fetch_channel"):
+                    thread = await forum_channel.guild.fetch_channel(thread_id)
+            except discord.NotFound:
+                snapshot.remove(thread_id)
+                continue
+            except discord.Forbidden:
+                print(f"   ⚠️  스레드 {thread_id}에 접근할 수 없습니다.")
+                continue
+        threads.append(thread)
+    return threads
@@ -0,0 +1,134 @@
+"""
+호스트별 요청 스케줄러
+
+링크 미리보기 요청이 한 블로그 플랫폼(velog.io, tistory.com 등)에 몰리지 않도록
+도메인마다 동시 요청 수를 제한하고, 429/503을 받은 도메인은 잠시 쉬게 합니다.
+
+- 도메인별 동시 요청 상한 (한 도메인이 막혀도 다른 도메인 요청은 계속 진행)
+- 전체 동시 요청 상한 (도메인 자리를 먼저 얻은 요청만 전체 자리를 기다리므로,
+  한 도메인의 대기 요청이 전체 자리를 차지하지 않고 도메인끼리 번갈아 진행됨)
+- 429/503 응답 시 Retry-After(없으면 지수 백오프)만큼 해당 도메인의 새 요청을 보류
+- h2 패키지가 있으면 HTTP/2 연결 하나로 같은 호스트 요청을 다중화
+"""
+
+import asyncio
+import importlib.util
+import ipaddress
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from metrics import metrics
+
+# 도메인 묶음 판단용 2단계 공통 접미사 (blog.example.co.kr → example.co.kr)
+SECOND_LEVEL_LABELS = {"co", "or", "ne", "go", "ac", "re", "pe", "com", "net", "org"}
+
+# 도메인을 쉬게 하는 응답 코드
+BACKOFF_STATUS_CODES = (429, 503)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def host_key(url: str) -> str:
+    """
+    동시 요청 상한을 공유할 도메인 키
+
+    같은 플랫폼의 사용자별 서브도메인(a.tistory.com, b.tistory.com)은 같은 서버로 가므로
+    등록 도메인 단위로 묶습니다.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    try:
+        # IP 주소는 묶지 않음
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostScheduler:
+    """도메인별 동시 요청 상한과 백오프"""
+
+    def __init__(
+        self,
+        per_host: int = 2,
+        total: int = 16,
+        backoff_base: float = 2.0,
+        max_backoff: float = 60.0,
+    ):
+        self.per_host = per_host
+        self.total = asyncio.Semaphore(total)
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.blocked_until: Dict[str, float] = {}
+        self.failures: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """도메인 자리 → (백오프 대기) → 전체 자리 순으로 얻은 뒤 요청 실행"""
+        key = host_key(url)
+        host_slot = self.host_slots.setdefault(key, asyncio.Semaphore(self.per_host))
+        started = time.monotonic()
+        async with host_slot:
+            # 도메인이 쉬는 중이면 도메인 자리를 잡은 채로 기다려 같은 도메인의 다른 요청도 보류
+            while (remaining := self.blocked_until.get(key, 0.0) - time.monotonic()) > 0:
+                await asyncio.sleep(remaining)
+            async with self.total:
+                metrics.observe("host_scheduler.wait", time.monotonic() - started)
+                yield
+
+    def backoff(self, url: str, retry_after: Optional[str] = None) -> float:
+        """
+        429/503을 받은 도메인의 새 요청을 보류
+
+        Returns:
+            float: 보류 시간 (초)
+        """
+        key = host_key(url)
+        failures = self.failures.get(key, 0)
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff_base * (2 ** failures) + random.uniform(0, self.backoff_base)
+        delay = min(delay, self.max_backoff)
+
+        self.failures[key] = failures + 1
+        self.blocked_until[key] = max(self.blocked_until.get(key, 0.0), time.monotonic() + delay)
+        metrics.incr("host_scheduler.backoff")
+        print(f"  (요청 보류) {key}: {delay:.1f}초")
+        return delay
+
+    def succeeded(self, url: str):
+        """정상 응답을 받으면 도메인의 연속 실패 횟수 초기화"""
+        self.failures.pop(host_key(url), None)
+
+
+def create_http_client(headers: dict, max_connections: int) -> httpx.AsyncClient:
+    """링크 미리보기용 HTTP 클라이언트 (h2가 있으면 HTTP/2)"""
+    return httpx.AsyncClient(
+        headers=headers,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
@@ -0,0 +1,42 @@
+"""
+실행 사이에 유지하는 JSON 파일 읽기/쓰기
+
+포럼 스냅샷, 썸네일 캐시, DM 전송 기록이 함께 사용합니다.
+- 읽기: 파일이 없으면 기본값, 손상되었으면 경고를 출력하고 기본값 (다음 저장 때 새로 만듦)
+- 쓰기: 임시 파일에 쓴 뒤 os.replace로 바꿔, 저장 중에 중단되어도 이전 파일이 깨지지 않음
+"""
+
+import json
+import os
+import sys
+from typing import Any
+
+
+def load_json(path: str, default: Any = None, label: str = "JSON") -> Any:
+    """
+    JSON 파일 읽기
+
+    Args:
+        path: 파일 경로
+        default: 파일이 없거나 읽을 수 없을 때 돌려줄 값
+        label: 경고 메시지에 쓸 파일 이름 (예: "스냅샷")
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        print(f"⚠️  {label} 파일을 읽을 수 없어 새로 만듭니다: {e}", file=sys.stderr)
+        return default
+
+
+def atomic_write_json(path: str, data: Any):
+    """임시 파일에 쓴 뒤 원래 경로로 바꿔 JSON 파일 저장"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
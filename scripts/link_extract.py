@@ -0,0 +1,125 @@
+"""
+글 본문 링크 추출/정규화
+
+Discord 메시지 본문에서 모든 http(s) 링크를 꺼내고, 썸네일 탐색에 가장 알맞은 링크를 고릅니다.
+
+링크 추출 (extract_links, 내보내는 글 링크로 그대로 사용):
+- 끝에 붙은 문장 부호, 닫는 괄호(마크다운 [제목](주소)), <주소> 표기 제거
+- **주소**처럼 앞뒤를 감싼 마크다운 강조 기호 제거 (앞에 같은 기호가 있을 때만)
+
+키 정규화 (canonicalize_url, 중복 제거/썸네일 캐시/요청 합치기 키로만 사용):
+- 추적용 쿼리(utm_*, fbclid 등)와 fragment 제거, scheme/host 소문자화, 기본 포트 제거
+- 퍼센트 인코딩 통일 (og_cache.normalize_url)
+"""
+
+import re
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from og_cache import normalize_url
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'`|]+", re.IGNORECASE)
+
+# 링크 끝에 붙어 있으면 링크의 일부가 아닌 것으로 보는 문자
+TRAILING_PUNCTUATION = ".,;:!?'\")]}>"
+
+# 마크다운 강조 기호 (링크 앞에 붙어 있을 때만 끝의 같은 기호를 떼어 냄)
+EMPHASIS_MARKS = re.compile(r"[*_~]+$")
+
+# 추적용 쿼리 파라미터 (앞부분 일치: utm_source, utm_medium, ...)
+TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "_hs", "pk_")
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "igsh", "ref_src", "spm"}
+
+# 썸네일 탐색 대상에서 뒤로 미룰 링크 (미리보기 이미지가 글과 상관없는 곳)
+LOW_PRIORITY_HOSTS = ("discord.com", "discord.gg", "discordapp.com")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif")
+
+
+def _trim(url: str, emphasis: str = "") -> str:
+    """
+    끝에 붙은 문장 부호 제거 (괄호는 짝이 맞지 않는 닫는 괄호만)
+
+    emphasis는 본문에서 링크 바로 앞에 붙은 강조 기호(**, _ 등)로, 끝에 같은 기호가 있으면 함께 뗍니다.
+    (https://blog.com/post_ 처럼 주소가 원래 _로 끝나는 경우는 그대로 둠)
+    """
+    while url:
+        if emphasis and url.endswith(emphasis):
+            url = url[:-len(emphasis)]
+            emphasis = ""
+            continue
+        if url[-1] not in TRAILING_PUNCTUATION:
+            break
+        if url[-1] == ")" and url.count("(") >= url.count(")"):
+            break
+        url = url[:-1]
+    return url
+
+
+def canonicalize_url(url: str) -> str:
+    """같은 글을 가리키는 URL이 같은 문자열이 되도록 정규화"""
+    parts = urlsplit(_trim(url.strip()))
+    host = parts.hostname or ""
+    port = parts.port
+    scheme = parts.scheme.lower()
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [
+        (key, value) for key, value in params
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    # 지운 파라미터가 없으면 원래 쿼리를 그대로 둠 (값 없는 "?123" 같은 쿼리 보존)
+    query = parts.query if len(kept) == len(params) else urlencode(kept)
+    return normalize_url(urlunsplit((scheme, host, parts.path, query, "")))
+
+
+def extract_links(content: str) -> List[str]:
+    """
+    본문의 모든 링크를 등장 순서대로 (문장 부호만 떼어 낸 원래 주소)
+
+    같은 글을 가리키는 링크(canonicalize_url이 같은 링크)는 처음 나온 것만 남깁니다.
+    """
+    content = content or ""
+    links = []
+    seen = set()
+    for match in URL_PATTERN.finditer(content):
+        emphasis = EMPHASIS_MARKS.search(content, max(0, match.start() - 3), match.start())
+        url = _trim(match.group(0), emphasis.group(0) if emphasis else "")
+        try:
+            key = canonicalize_url(url)
+        except ValueError:
+            # 잘못된 포트 번호 등 해석할 수 없는 주소
+            continue
+        if urlsplit(key).hostname and key not in seen:
+            seen.add(key)
+            links.append(url)
+    return links
+
+
+def is_image_link(url: str) -> bool:
+    """이미지 파일을 직접 가리키는 링크인지 (요청 없이 썸네일로 바로 사용)"""
+    return urlsplit(url).path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _preview_rank(url: str) -> tuple:
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    low_priority = host == "" or any(host == h or host.endswith("." + h) for h in LOW_PRIORITY_HOSTS)
+    # 사이트 첫 화면보다 개별 글 주소가 글에 맞는 미리보기 이미지를 가질 가능성이 큼
+    is_root = parts.path in ("", "/")
+    return (low_priority, is_root)
+
+
+def pick_article_link(links: List[str]) -> Optional[str]:
+    """
+    글 링크(url 필드, 썸네일 탐색 대상)로 쓸 링크 선택
+
+    이미지 파일 링크와 Discord 링크는 뒤로 미루고, 사이트 첫 화면보다 개별 글 주소를 우선하며,
+    조건이 같으면 본문에 먼저 나온 링크를 사용합니다.
+    """
+    candidates = [link for link in links if not is_image_link(link)]
+    if not candidates:
+        return None
+    return min(candidates, key=_preview_rank)
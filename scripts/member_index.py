@@ -0,0 +1,106 @@
+"""
+대상 사용자(TARGET_USERS) → 서버 멤버 조회 인덱스
+
+guild.members를 사용자마다 선형 탐색하는 대신 실행당 한 번 name/id 딕셔너리를 만들고,
+캐시에 없는 사용자만 개별 조회(guild.fetch_member / guild.query_members)합니다.
+따라서 시작 시 서버 전체 멤버 목록을 받아오지(chunking) 않아도 동작합니다.
+REST 전용 실행(DISCORD_REST_ONLY)에서는 이름 검색(query_members)이 게이트웨이 요청이라 쓸 수 없으므로,
+캐시에 없는 이름이 처음 나왔을 때 guild.fetch_members로 멤버 목록을 한 번 받아 인덱스를 채웁니다.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import discord
+
+from discord_rest import REST_ONLY
+from metrics import metrics
+
+
+class MemberIndex:
+    """서버 멤버 name/id 조회 인덱스"""
+
+    def __init__(self, guild: discord.Guild, rest_only: bool = REST_ONLY):
+        """
+        Args:
+            guild: 멤버를 찾을 서버
+            rest_only: True면 이름 검색에 게이트웨이 요청(query_members) 대신 guild.fetch_members 사용
+        """
+        self.guild = guild
+        self.rest_only = rest_only
+        self.by_id: Dict[int, discord.Member] = {}
+        self.by_name: Dict[str, discord.Member] = {}
+        self.fetched_all = False
+        for member in guild.members:
+            self.add(member)
+
+    def add(self, member: discord.Member):
+        self.by_id[member.id] = member
+        self.by_name[member.name] = member
+
+    async def resolve_id(self, member_id: int) -> Optional[discord.Member]:
+        """id로 멤버 조회 (인덱스에 없으면 REST로 한 번 조회)"""
+        member = self.by_id.get(member_id)
+        if member is not None:
+            return member
+
+        try:
+            with metrics.timer("discord.fetch_member"):
+                member = await self.guild.fetch_member(member_id)
+        except (discord.NotFound, discord.Forbidden):
+            return None
+        self.add(member)
+        return member
+
+    async def resolve_name(self, username: str) -> Optional[discord.Member]:
+        """username으로 멤버 조회 (인덱스에 없으면 이름으로 검색)"""
+        member = self.by_name.get(username)
+        if member is not None:
+            return member
+
+        if self.rest_only:
+            await self.fetch_all()
+            return self.by_name.get(username)
+
+        try:
+            with metrics.timer("discord.query_members"):
+                candidates = await self.guild.query_members(query=username, limit=10)
+        except (discord.ClientException, discord.HTTPException, TimeoutError):
+            return None
+
+        for candidate in candidates:
+            self.add(candidate)
+        return self.by_name.get(username)
+
+    async def fetch_all(self):
+        """서버 멤버 목록을 REST로 한 번 받아 인덱스에 추가 (members 인텐트 필요)"""
+        if self.fetched_all:
+            return
+        self.fetched_all = True
+        try:
+            with metrics.timer("discord.fetch_members"):
+                async for member in self.guild.fetch_members(limit=None):
+                    self.add(member)
+        except (discord.ClientException, discord.HTTPException) as e:
+            print(f"⚠️  서버 멤버 목록을 가져올 수 없습니다: {e}")
+
+    async def resolve(self, target: str) -> Optional[discord.Member]:
+        """TARGET_USERS 항목 하나를 멤버로 변환 (숫자면 사용자 id, 아니면 username)"""
+        if target.isdigit():
+            return await self.resolve_id(int(target))
+        return await self.resolve_name(target)
+
+    async def resolve_targets(self, targets: Iterable[str]) -> Dict[str, discord.Member]:
+        """
+        대상 사용자 목록을 멤버로 변환
+
+        Returns:
+            Dict[str, discord.Member]: TARGET_USERS 항목 → 멤버 (찾지 못한 항목은 제외)
+        """
+        resolved = {}
+        for target in targets:
+            member = await self.resolve(target)
+            if member:
+                resolved[target] = member
+            else:
+                print(f"⚠️  '{target}' 멤버를 찾을 수 없습니다.")
+        return resolved
@@ -0,0 +1,177 @@
+"""
+실행 통계 수집
+
+세 스크립트가 공유하는 가벼운 계측 모듈입니다. 느린 실행이 아카이브 목록 페이지 조회,
+history 순회, 썸네일 탐색, 메시지 전송 중 어디에서 시간을 썼는지 알 수 있도록
+다음 값을 모아 종료 시 JSON으로 출력합니다.
+
+- 단계(phase)별 소요 시간
+- 카운터 (API 호출, 캐시 적중, 내려받은 바이트 등)
+- 외부 호출별 지연 시간 히스토그램 (횟수, 백분위수, 구간별 개수, 오류 수)
+
+    with metrics.phase("export"):
+        ...
+    with metrics.timer("discord.fetch_message"):
+        message = await thread.fetch_message(thread.id)
+    metrics.incr("og_cache.hit")
+
+GitHub Actions에서 실행되면(GITHUB_STEP_SUMMARY) 같은 내용을 작업 요약에 표로 추가합니다.
+(METRICS_STEP_SUMMARY=0 이면 생략, METRICS_FILE을 지정하면 JSON을 파일로 저장)
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# 히스토그램 구간 상한 (밀리초)
+BUCKET_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Histogram:
+    """지연 시간 표본 (초 단위로 받아 밀리초로 요약)"""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.errors = 0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds * 1000)
+
+    def summary(self) -> dict:
+        if not self.samples:
+            return {"count": 0, "errors": self.errors}
+
+        values = sorted(self.samples)
+        buckets = {f"<={bound}ms": 0 for bound in BUCKET_BOUNDS_MS}
+        buckets[f">{BUCKET_BOUNDS_MS[-1]}ms"] = 0
+        for value in values:
+            for bound in BUCKET_BOUNDS_MS:
+                if value <= bound:
+                    buckets[f"<={bound}ms"] += 1
+                    break
+            else:
+                buckets[f">{BUCKET_BOUNDS_MS[-1]}ms"] += 1
+
+        return {
+            "count": len(values),
+            "errors": self.errors,
+            "total_ms": round(sum(values), 1),
+            "min_ms": round(values[0], 1),
+            "p50_ms": round(_percentile(values, 50), 1),
+            "p90_ms": round(_percentile(values, 90), 1),
+            "p99_ms": round(_percentile(values, 99), 1),
+            "max_ms": round(values[-1], 1),
+            "buckets": {name: count for name, count in buckets.items() if count},
+        }
+
+
+class Metrics:
+    """단계 시간, 카운터, 지연 시간 히스토그램 모음"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """모든 값을 지우고 실행 시작 시각을 다시 잡음"""
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.counters: Counter = Counter()
+        self.histograms: Dict[str, Histogram] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """블록 소요 시간을 단계 시간에 더함 (같은 이름을 여러 번 쓰면 합산)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """외부 호출 하나의 지연 시간을 히스토그램에 기록 (예외가 나면 오류 수도 증가)"""
+        histogram = self.histograms.setdefault(name, Histogram())
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            histogram.errors += 1
+            raise
+        finally:
+            histogram.add(time.perf_counter() - started)
+
+    def observe(self, name: str, seconds: float):
+        """이미 잰 시간을 히스토그램에 기록 (대기 시간 등 with 블록으로 감싸기 어려운 경우)"""
+        self.histograms.setdefault(name, Histogram()).add(seconds)
+
+    def incr(self, name: str, value: int = 1):
+        """카운터 증가"""
+        self.counters[name] += value
+
+    def summary(self, script: str) -> dict:
+        """직렬화 가능한 통계 요약"""
+        return {
+            "script": script,
+            "total_seconds": round(time.perf_counter() - self.started_at, 3),
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "counters": dict(sorted(self.counters.items())),
+            "latency": {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+        }
+
+    def _step_summary_markdown(self, summary: dict) -> str:
+        lines = [f"### 📈 {summary['script']} 실행 통계 ({summary['total_seconds']:.1f}초)", ""]
+        if summary["phases"]:
+            lines += ["| 단계 | 시간(초) |", "| --- | ---: |"]
+            lines += [f"| {name} | {seconds:.2f} |" for name, seconds in summary["phases"].items()]
+            lines.append("")
+        if summary["latency"]:
+            lines += ["| 호출 | 횟수 | 오류 | p50(ms) | p90(ms) | p99(ms) | 최대(ms) |",
+                      "| --- | ---: | ---: | ---: | ---: | ---: | ---: |"]
+            for name, latency in summary["latency"].items():
+                if not latency["count"]:
+                    continue
+                lines.append(
+                    f"| {name} | {latency['count']} | {latency['errors']} | {latency['p50_ms']} "
+                    f"| {latency['p90_ms']} | {latency['p99_ms']} | {latency['max_ms']} |"
+                )
+            lines.append("")
+        if summary["counters"]:
+            lines += ["| 카운터 | 값 |", "| --- | ---: |"]
+            lines += [f"| {name} | {value} |" for name, value in summary["counters"].items()]
+            lines.append("")
+        return "\n".join(lines) + "\n"
+
+    def emit(self, script: str):
+        """
+        종료 시 통계 출력
+
+        METRICS_FILE이 있으면 JSON 파일로, 없으면 표준 출력으로 내보내고,
+        GitHub Actions에서는 작업 요약(GITHUB_STEP_SUMMARY)에도 추가합니다.
+        """
+        summary = self.summary(script)
+
+        metrics_file = os.getenv("METRICS_FILE")
+        if metrics_file:
+            os.makedirs(os.path.dirname(os.path.abspath(metrics_file)), exist_ok=True)
+            with open(metrics_file, "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f"📈 실행 통계 저장: {metrics_file}")
+        else:
+            print(f"📈 실행 통계: {json.dumps(summary, ensure_ascii=False)}")
+
+        step_summary = os.getenv("GITHUB_STEP_SUMMARY")
+        if step_summary and os.getenv("METRICS_STEP_SUMMARY", "1").lower() not in ("0", "false", "no"):
+            with open(step_summary, "a", encoding="utf-8") as f:
+                f.write(self._step_summary_markdown(summary))
+
+
+# 프로세스 전체에서 공유하는 인스턴스
+metrics = Metrics()
@@ -0,0 +1,172 @@
+"""
+링크 썸네일(og:image) 디스크 캐시
+
+fetch_forum_data.py가 블로그 링크의 썸네일을 매번 다시 스크래핑하지 않도록
+정규화된 URL을 키로 결과를 JSON 파일에 저장합니다.
+
+- 썸네일을 찾은 결과는 TTL 동안 재사용
+- 404, og:image 없음 같은 실패 결과도 더 짧은 TTL로 캐시 (negative caching)
+- ETag / Last-Modified 검증자를 함께 저장해 만료된 항목은 조건부 요청으로 재검증
+- 항목 수가 상한을 넘으면 가장 오래 전에 조회한 항목부터 제거
+  (적중할 때마다 사용 시각을 바꾸면 매 실행 캐시 파일이 바뀌므로 조회 시각 기준)
+"""
+
+import re
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlsplit, urlunsplit
+
+from json_store import atomic_write_json, load_json
+
+CACHE_VERSION = 1
+
+# 썸네일을 찾은 결과의 유효 기간
+DEFAULT_TTL = 7 * 24 * 60 * 60
+# 실패 결과(404, og:image 없음)의 유효 기간
+DEFAULT_NEGATIVE_TTL = 24 * 60 * 60
+# 캐시 최대 항목 수
+DEFAULT_MAX_ENTRIES = 2000
+
+# RFC 3986 비예약 문자: 인코딩 여부와 상관없이 같은 뜻
+UNRESERVED = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~")
+PERCENT_ESCAPE = re.compile(r"%([0-9A-Fa-f]{2})")
+
+
+def normalize_url(url: str) -> str:
+    """
+    캐시 키로 쓸 URL 정규화
+
+    scheme/host 소문자화, fragment 제거, 경로/쿼리의 퍼센트 인코딩 통일
+    (velog 등에서 같은 한글 주소가 인코딩 여부만 다르게 공유되는 경우를 같은 키로 취급)
+    """
+    parts = urlsplit(url.strip())
+    path = _normalize_escapes(parts.path, safe="/:@!$&'()*+,;=") or "/"
+    query = _normalize_escapes(parts.query, safe="/:@!$&'()*+,;=?")
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def _normalize_escapes(text: str, safe: str) -> str:
+    """
+    인코딩하지 않은 문자(한글 등)는 UTF-8 퍼센트 인코딩으로, 이미 인코딩된 비예약 문자는 원래 문자로
+
+    예약 문자(&, =, / 등)의 인코딩 여부는 뜻이 다르므로 그대로 둡니다.
+    (?q=a%26b와 ?q=a&b는 다른 주소)
+    """
+    pieces = []
+    pos = 0
+    for match in PERCENT_ESCAPE.finditer(text):
+        pieces.append(quote(text[pos:match.start()], safe=safe))
+        char = chr(int(match.group(1), 16))
+        pieces.append(char if char in UNRESERVED else "%" + match.group(1).upper())
+        pos = match.end()
+    pieces.append(quote(text[pos:], safe=safe))
+    return "".join(pieces)
+
+
+class OGImageCache:
+    """URL별 og:image 조회 결과 캐시"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.entries: Dict[str, dict] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.revalidated = 0
+
+    def load(self):
+        """캐시 파일 읽기 (형식 버전이 다르면 빈 캐시)"""
+        data = load_json(self.path, {}, "썸네일 캐시")
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("entries", {})
+
+    def save(self):
+        """조회 시각 기준으로 항목 수 상한을 맞춘 뒤 저장"""
+        if len(self.entries) > self.max_entries:
+            recent = sorted(self.entries.items(), key=lambda item: item[1].get("fetched_at", 0), reverse=True)
+            self.entries = dict(recent[:self.max_entries])
+
+        atomic_write_json(self.path, {"version": CACHE_VERSION, "entries": self.entries})
+
+    def get_entry(self, url: str) -> Optional[dict]:
+        """만료 여부와 상관없이 저장된 항목 반환 (재검증용 ETag 등을 꺼낼 때 사용)"""
+        return self.entries.get(normalize_url(url))
+
+    def lookup(self, url: str) -> Tuple[bool, Optional[str]]:
+        """
+        유효한 캐시 항목 조회
+
+        Returns:
+            Tuple[bool, Optional[str]]: (캐시 적중 여부, 썸네일 URL 또는 None)
+        """
+        entry = self.entries.get(normalize_url(url))
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        thumbnail = entry.get("thumbnail")
+        ttl = self.ttl if thumbnail else self.negative_ttl
+        now = time.time()
+        if now - entry.get("fetched_at", 0) > ttl:
+            self.misses += 1
+            return False, None
+
+        if thumbnail:
+            self.hits += 1
+        else:
+            self.negative_hits += 1
+        return True, thumbnail
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """저장된 검증자로 만든 조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        entry = self.get_entry(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def mark_revalidated(self, url: str) -> Optional[str]:
+        """304 Not Modified 응답을 받은 항목의 유효 기간을 갱신하고 저장된 썸네일 반환"""
+        entry = self.get_entry(url)
+        if entry is None:
+            return None
+        entry["fetched_at"] = time.time()
+        self.revalidated += 1
+        return entry.get("thumbnail")
+
+    def store(
+        self,
+        url: str,
+        thumbnail: Optional[str],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """조회 결과 저장 (thumbnail이 None이면 실패 결과로 저장)"""
+        self.entries[normalize_url(url)] = {
+            "thumbnail": thumbnail,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        self.stores += 1
+
+    def summary(self) -> str:
+        """적중/실패 통계 요약 문자열"""
+        lookups = self.hits + self.negative_hits + self.misses
+        hit_rate = (self.hits + self.negative_hits) / lookups * 100 if lookups else 0.0
+        return (f"썸네일 캐시: 적중 {self.hits}, 실패 결과 적중 {self.negative_hits}, "
+                f"미스 {self.misses} (적중률 {hit_rate:.1f}%), 재검증(304) {self.revalidated}, "
+                f"저장 {self.stores}, 항목 {len(self.entries)}개")
@@ -0,0 +1,136 @@
+"""
+링크 미리보기 이미지(og:image 등) HTML 파싱
+
+BeautifulSoup 파싱은 CPU 작업이라 이벤트 루프에서 바로 실행하면 그동안 진행 중인
+다른 Discord/HTTP 요청이 모두 멈춥니다. 이 모듈은 파싱을 별도 실행기(스레드 또는 프로세스 풀)로
+넘겨 네트워크 대기와 파싱이 번갈아가지 않고 겹치도록 합니다.
+
+파서 백엔드 (HTML_PARSER):
+    auto         lxml이 설치되어 있으면 lxml, 아니면 html.parser (기본값)
+    lxml         lxml (C 구현, 빠름)
+    html.parser  파이썬 표준 라이브러리
+
+실행기 (HTML_PARSE_EXECUTOR):
+    thread   스레드 풀 (기본값, 시작 비용 없음. lxml은 파싱 중 GIL을 놓아 병렬로도 동작)
+    process  프로세스 풀 (html.parser처럼 GIL을 잡는 파서도 병렬 실행, 대신 데이터 복사 비용)
+
+bench_parse.py로 백엔드/실행기별 처리량을 비교할 수 있습니다.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401  선택 의존성: 설치되어 있으면 더 빠른 파서 사용
+except ImportError:
+    lxml = None
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+_executor: Optional[Executor] = None
+
+
+def available_backends() -> list:
+    """설치되어 사용할 수 있는 파서 백엔드 목록"""
+    return [backend for backend in PARSER_BACKENDS if backend != "lxml" or lxml is not None]
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """설정값(auto/lxml/html.parser)을 실제로 사용할 백엔드로 변환"""
+    name = (name or os.environ.get("HTML_PARSER") or "auto").lower()
+    if name == "auto":
+        return "lxml" if lxml is not None else "html.parser"
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"알 수 없는 HTML_PARSER: {name} (가능: auto, {', '.join(PARSER_BACKENDS)})")
+    if name == "lxml" and lxml is None:
+        # 요청한 백엔드가 없으면 표준 파서로 대체
+        return "html.parser"
+    return name
+
+
+def extract_preview_image(
+    head_html: bytes,
+    base_url: str,
+    encoding: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> Optional[str]:
+    """
+    <head> HTML에서 미리보기 이미지를 찾습니다.
+    og:image → twitter:image → <link rel="image_src"> 순서로 확인합니다.
+    """
+    soup = BeautifulSoup(head_html, resolve_backend(backend), from_encoding=encoding)
+
+    candidates = [
+        soup.find('meta', property='og:image'),
+        soup.find('meta', property='og:image:url'),
+        soup.find('meta', attrs={'name': 'twitter:image'}),
+        soup.find('meta', property='twitter:image'),
+        soup.find('meta', attrs={'name': 'twitter:image:src'}),
+    ]
+    for tag in candidates:
+        if tag and tag.get('content'):
+            return urljoin(base_url, tag['content'].strip())
+
+    image_src = soup.find('link', rel='image_src')
+    if image_src and image_src.get('href'):
+        return urljoin(base_url, image_src['href'].strip())
+
+    return None
+
+
+def parse_workers() -> int:
+    """동시에 파싱할 작업 수 (HTML_PARSE_WORKERS, 기본: CPU 수, 최대 4)"""
+    value = os.environ.get("HTML_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+    try:
+        return max(1, int(value))
+    except ValueError:
+        raise ValueError(f"HTML_PARSE_WORKERS가 올바른 숫자 형식이 아닙니다: {value}") from None
+
+
+def create_executor(kind: Optional[str] = None, workers: Optional[int] = None) -> Executor:
+    """파싱 실행기 생성 (thread / process)"""
+    kind = (kind or os.environ.get("HTML_PARSE_EXECUTOR") or "thread").lower()
+    workers = workers or parse_workers()
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="html-parse")
+    raise ValueError(f"알 수 없는 HTML_PARSE_EXECUTOR: {kind} (가능: thread, process)")
+
+
+def get_executor() -> Executor:
+    """
+    프로세스 전체에서 공유하는 파싱 실행기 (처음 사용할 때 생성)
+
+    설정(HTML_PARSE_EXECUTOR, HTML_PARSE_WORKERS)이 잘못되었으면 ValueError가 나므로,
+    파싱 도중이 아니라 작업을 시작하기 전에 한 번 호출해 확인합니다.
+    """
+    global _executor
+    if _executor is None:
+        _executor = create_executor()
+    return _executor
+
+
+def shutdown_executor():
+    """공유 실행기 종료 (프로세스 풀이면 작업 프로세스 정리)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+async def parse_preview_image(
+    head_html: bytes,
+    base_url: str,
+    encoding: Optional[str] = None,
+) -> Optional[str]:
+    """extract_preview_image를 이벤트 루프 밖의 실행기에서 실행"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), extract_preview_image, head_html, base_url, encoding, resolve_backend()
+    )
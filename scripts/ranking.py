@@ -0,0 +1,71 @@
+"""
+글 순위 계산
+
+weekly_check.py의 주간 HOT 글과 fetch_forum_data.py의 트렌딩/최신/작성자별 목록이
+같은 HOT 스코어(댓글 + 반응)를 사용하도록 모아 둔 모듈입니다.
+댓글 수는 시작 메시지를 뺀 메시지 수입니다. (Discord 스레드의 message_count와 같은 기준)
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# 트렌딩 점수의 시간 감쇠 정도 (클수록 오래된 글이 빨리 내려감)
+TRENDING_GRAVITY = 1.5
+# 막 올라온 글의 점수가 과하게 커지지 않도록 더하는 시간 (시간)
+TRENDING_AGE_OFFSET_HOURS = 2
+
+
+def hot_score(comment_count: int, reaction_count: int) -> int:
+    """HOT 스코어 = 댓글 수(시작 메시지 제외) + 반응 수"""
+    return comment_count + reaction_count
+
+
+def trending_score(score: int, created_at: Optional[datetime], now: datetime) -> float:
+    """
+    HOT 스코어에 글의 나이에 따른 감쇠를 적용한 트렌딩 점수
+
+        (HOT + 1) / (나이(시간) + 2) ^ 1.5
+
+    작성 시각을 모르는 글은 맨 뒤로 보냅니다.
+    """
+    if created_at is None:
+        return 0.0
+    age_hours = max(0.0, (now - created_at).total_seconds() / 3600)
+    return (score + 1) / (age_hours + TRENDING_AGE_OFFSET_HOURS) ** TRENDING_GRAVITY
+
+
+def build_rankings(posts: List[dict], now: Optional[datetime] = None) -> dict:
+    """
+    정렬된 글 id(문자열) 목록 생성
+
+    Args:
+        posts: 내보낸 글 목록 (comments, likes, createdAt 사용)
+        now: 트렌딩 계산 기준 시각 (기본값: 현재)
+
+    Returns:
+        dict: {"trending": [...], "recent": [...], "authors": {작성자: [...]}}
+    """
+    now = now or datetime.now(timezone.utc)
+
+    def created_at(post: dict) -> Optional[datetime]:
+        return datetime.fromisoformat(post["createdAt"]) if post.get("createdAt") else None
+
+    recent = sorted(posts, key=lambda post: (post.get("createdAt") or "", post["id"]), reverse=True)
+
+    trending = sorted(
+        recent,
+        key=lambda post: trending_score(
+            hot_score(post.get("comments") or 0, post.get("likes") or 0), created_at(post), now
+        ),
+        reverse=True,
+    )
+
+    authors: Dict[str, List[str]] = {}
+    for post in recent:
+        authors.setdefault(post["author"], []).append(str(post["id"]))
+
+    return {
+        "trending": [str(post["id"]) for post in trending],
+        "recent": [str(post["id"]) for post in recent],
+        "authors": authors,
+    }
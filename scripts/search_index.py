@@ -0,0 +1,89 @@
+"""
+글 검색용 역색인(inverted index)
+
+text_digest.tokenize로 만든 토큰(한글 bigram, 영문/숫자 단어)마다 그 토큰이 들어 있는
+글 목록(posting list)을 저장합니다. 검색은 질의를 같은 방식으로 토큰화한 뒤
+토큰별 posting list를 찾아 교집합을 구하면 되므로 전체 본문을 훑지 않습니다.
+
+직렬화 형식 (search-index.json):
+
+    {
+      "version": 1,
+      "docs": ["<post id>", ...],          # posting list의 번호 → 글 id
+      "terms": {"토큰": [0, 3, 2], ...}     # 글 번호를 오름차순으로 정렬한 뒤 앞 번호와의 차이로 저장
+    }
+
+위 예시의 [0, 3, 2]는 글 번호 0, 3, 5를 뜻합니다. 차이값은 대부분 작은 수라 JSON이 짧아집니다.
+"""
+
+from typing import Dict, List
+
+from text_digest import tokenize
+
+SEARCH_INDEX_VERSION = 1
+
+
+def _delta_encode(numbers: List[int]) -> List[int]:
+    encoded = []
+    previous = 0
+    for number in numbers:
+        encoded.append(number - previous)
+        previous = number
+    return encoded
+
+
+def _delta_decode(deltas: List[int]) -> List[int]:
+    numbers = []
+    current = 0
+    for delta in deltas:
+        current += delta
+        numbers.append(current)
+    return numbers
+
+
+def build_search_index(digests: List[dict]) -> dict:
+    """
+    글 요약(text_digest.build_digest 결과) 목록으로 역색인 생성
+
+    Args:
+        digests: 글 요약 목록 (id, tokens 필요)
+
+    Returns:
+        dict: 직렬화 가능한 역색인
+    """
+    postings: Dict[str, List[int]] = {}
+    for doc_number, digest in enumerate(digests):
+        for token in digest["tokens"]:
+            postings.setdefault(token, []).append(doc_number)
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "docs": [digest["id"] for digest in digests],
+        # 글 번호는 추가 순서대로 이미 오름차순
+        "terms": {term: _delta_encode(postings[term]) for term in sorted(postings)},
+    }
+
+
+def search(index: dict, query: str) -> List[str]:
+    """
+    역색인에서 질의의 모든 토큰을 포함하는 글 id 목록 반환 (색인 순서)
+
+    짧은 posting list부터 교집합을 구해 중간 결과를 작게 유지합니다.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    terms = index["terms"]
+    if any(token not in terms for token in tokens):
+        return []
+
+    posting_lists = sorted((terms[token] for token in tokens), key=len)
+    matches = set(_delta_decode(posting_lists[0]))
+    for deltas in posting_lists[1:]:
+        matches.intersection_update(_delta_decode(deltas))
+        if not matches:
+            return []
+
+    docs = index["docs"]
+    return [docs[doc_number] for doc_number in sorted(matches)]
@@ -0,0 +1,42 @@
+"""
+같은 키의 비동기 작업 합치기 (single-flight)
+
+여러 스레드가 같은 글이나 같은 블로그 주소를 링크해도 한 실행에서 한 번만 요청하도록,
+키(정규화된 URL)마다 하나의 작업만 만들고 같은 키를 요청한 나머지는 그 결과를 함께 기다립니다.
+끝난 작업의 결과도 실행이 끝날 때까지 보관해 나중에 온 요청도 다시 보내지 않습니다.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """키별 진행 중/완료된 작업 모음"""
+
+    def __init__(self):
+        self.tasks: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        key에 해당하는 작업의 결과 반환 (없으면 factory()로 새로 시작)
+
+        기다리던 쪽 하나가 취소되어도 공유 작업은 취소되지 않도록 shield로 기다립니다.
+        """
+        task = self.tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self.tasks[key] = task
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def cancel_pending(self):
+        """끝나지 않은 공유 작업 취소 (기다리던 쪽이 모두 중단된 뒤 정리용)"""
+        for task in self.tasks.values():
+            if not task.done():
+                task.cancel()
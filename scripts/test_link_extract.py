@@ -0,0 +1,41 @@
+"""
+link_extract 동작 확인 (scripts 디렉토리에서: python -m pytest test_link_extract.py)
+"""
+
+from link_extract import canonicalize_url, extract_links, pick_article_link
+
+
+def test_canonicalize_drops_tracking_params_and_fragment():
+    assert canonicalize_url("HTTPS://Blog.com:443/p?utm_source=x&id=1#top") == "https://blog.com/p?id=1"
+
+
+def test_canonicalize_keeps_encoded_reserved_characters_in_query():
+    assert canonicalize_url("https://x.com/s?q=a%26b") != canonicalize_url("https://x.com/s?q=a&b")
+
+
+def test_canonicalize_unifies_percent_encoding():
+    assert canonicalize_url("https://velog.io/@a/한글") == canonicalize_url("https://velog.io/@a/%ed%95%9c%ea%b8%80")
+
+
+def test_extract_keeps_original_url():
+    content = "https://x.github.io/#/post/12 https://blog.com/post_ https://velog.io/@a/한글-글"
+    assert extract_links(content) == [
+        "https://x.github.io/#/post/12",
+        "https://blog.com/post_",
+        "https://velog.io/@a/한글-글",
+    ]
+
+
+def test_extract_trims_markdown_and_punctuation():
+    content = "**https://a.com/x**, [글](https://b.com/y). (https://en.wikipedia.org/wiki/A_(b))"
+    assert extract_links(content) == ["https://a.com/x", "https://b.com/y", "https://en.wikipedia.org/wiki/A_(b)"]
+
+
+def test_extract_dedupes_by_canonical_key():
+    content = "https://a.com/x?utm_source=z https://a.com/x"
+    assert extract_links(content) == ["https://a.com/x?utm_source=z"]
+
+
+def test_pick_prefers_article_over_image_and_discord_links():
+    links = ["https://cdn.com/a.png", "https://discord.com/channels/1", "https://blog.com/", "https://blog.com/post"]
+    assert pick_article_link(links) == "https://blog.com/post"
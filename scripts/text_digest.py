@@ -0,0 +1,96 @@
+"""
+글 본문 요약/토큰화
+
+내보내기 시점에 한 번만 계산해 두면 클라이언트가 본문 전체를 받지 않고도
+카드 미리보기와 검색 필터를 처리할 수 있는 값들을 만듭니다.
+
+- 마크다운/멘션/URL을 걷어낸 평문 발췌
+- 글자 수, 단어 수, 예상 읽기 시간
+- 소문자로 정규화한 검색 토큰 (한글은 2글자 단위 bigram)
+"""
+
+import math
+import re
+from typing import List
+
+# 발췌 최대 길이 (글자)
+EXCERPT_LENGTH = 120
+
+# 분당 읽기 속도: 한글은 글자 수, 그 외는 단어 수 기준
+HANGUL_CHARS_PER_MINUTE = 500
+WORDS_PER_MINUTE = 200
+
+URL_PATTERN = re.compile(r"https?://\S+")
+# Discord 멘션/채널/커스텀 이모지 (<@123>, <#123>, <:name:123>)
+DISCORD_TOKEN_PATTERN = re.compile(r"<(?:@[!&]?|#|a?:\w+:)\d+>")
+# 마크다운 강조/코드/인용/제목 기호
+MARKDOWN_PATTERN = re.compile(r"(\*\*|__|~~|\|\||`+|^>+\s?|^#+\s)", re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+HANGUL_WORD_PATTERN = re.compile(r"[가-힣]+")
+HANGUL_CHAR_PATTERN = re.compile(r"[가-힣]")
+# 한글 단어 또는 영문/숫자 단어
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[0-9a-z]+")
+
+
+def to_plain_text(content: str) -> str:
+    """URL, Discord 멘션, 마크다운 기호를 제거하고 공백을 정리한 평문"""
+    text = URL_PATTERN.sub(" ", content or "")
+    text = DISCORD_TOKEN_PATTERN.sub(" ", text)
+    text = MARKDOWN_PATTERN.sub("", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def make_excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """평문 앞부분 발췌 (잘렸으면 말줄임표)"""
+    if len(text) <= length:
+        return text
+    return text[:length].rstrip() + "…"
+
+
+def reading_minutes(text: str) -> int:
+    """예상 읽기 시간 (분, 최소 1분)"""
+    hangul_chars = len(HANGUL_CHAR_PATTERN.findall(text))
+    other_words = len(HANGUL_WORD_PATTERN.sub(" ", text).split())
+    minutes = hangul_chars / HANGUL_CHARS_PER_MINUTE + other_words / WORDS_PER_MINUTE
+    return max(1, math.ceil(minutes))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색 토큰 (중복 제거, 출현 순서 유지)
+
+    영문/숫자는 소문자 단어 단위, 한글은 띄어쓰기와 조사에 상관없이 부분 일치하도록
+    2글자 bigram으로 나눕니다. (한 글자 단어는 그대로)
+        "액세스 토큰을" → ["액세", "세스", "토큰", "큰을"]
+    """
+    tokens = []
+    seen = set()
+    for word in TOKEN_PATTERN.findall((text or "").lower()):
+        if HANGUL_WORD_PATTERN.fullmatch(word) and len(word) > 1:
+            parts = [word[i:i + 2] for i in range(len(word) - 1)]
+        else:
+            parts = [word]
+        for part in parts:
+            if part not in seen:
+                seen.add(part)
+                tokens.append(part)
+    return tokens
+
+
+def build_digest(post: dict) -> dict:
+    """
+    글 하나의 요약 정보
+
+    Returns:
+        dict: id(문자열), 발췌, 글자/단어 수, 읽기 시간, 검색 토큰
+    """
+    text = to_plain_text(post.get("content") or "")
+    return {
+        "id": str(post["id"]),
+        "excerpt": make_excerpt(text),
+        "chars": len(text.replace(" ", "")),
+        "words": len(text.split()),
+        "readingMinutes": reading_minutes(text),
+        "tokens": tokenize(f"{post.get('title') or ''} {text}"),
+    }
@@ -0,0 +1,259 @@
+"""
+썸네일 로컬 저장/축소
+
+fetch_forum_data.py가 내보내는 thumbnail은 og:image나 Discord 첨부 파일의 원본 URL이라
+카드마다 1~2MB짜리 원본 이미지를 받게 되고, Discord CDN 첨부 URL은 시간이 지나면 만료됩니다.
+이 모듈은 각 썸네일을 한 번만 내려받아 내용 해시로 이름을 붙이고, 카드 크기에 맞춘
+WebP/JPEG 사본을 만들어 thumbnail을 로컬 파일 경로로 바꿉니다.
+
+    {THUMBNAIL_DIR}/{해시}.webp
+    {THUMBNAIL_DIR}/{해시}.jpg
+
+- 원본 URL → 해시 매핑을 캐시 파일에 저장하고, 사본 파일이 남아 있으면 다시 받지 않음
+- 같은 이미지가 여러 URL로 올라와도 해시가 같으므로 한 벌만 저장
+- 내려받기는 동시 요청 수를, 이미지 변환(CPU 작업)은 스레드 풀 크기를 제한
+- Pillow가 없거나 내려받기/변환에 실패하면 원본 URL을 그대로 사용
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from json_store import atomic_write_json, load_json
+from metrics import metrics
+
+try:
+    from PIL import Image  # 선택 의존성: 설치되어 있을 때만 썸네일 변환
+except ImportError:
+    Image = None
+
+CACHE_VERSION = 1
+
+# 카드 썸네일 가로 크기 (고해상도 화면을 고려해 카드 폭의 약 2배)
+DEFAULT_WIDTH = 640
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+# 이보다 큰 원본은 내려받지 않음
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+
+# 만료 서명 등 같은 첨부 파일이라도 매번 달라지는 Discord CDN 쿼리 파라미터가 붙는 호스트
+DISCORD_CDN_HOSTS = ("cdn.discordapp.com", "media.discordapp.net")
+
+# 이 저장소가 만드는 파일 이름 (내용 해시 20자 + 확장자). 정리할 때 이 형식의 파일만 지움
+STORED_FILE_NAME = re.compile(r"^([0-9a-f]{20})\.(webp|jpg)$")
+
+
+def source_key(url: str) -> str:
+    """
+    캐시 키로 쓸 원본 URL
+
+    Discord CDN 첨부 URL은 만료 서명(ex, is, hm) 쿼리만 바뀌므로 쿼리를 떼고 비교합니다.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    query = "" if host in DISCORD_CDN_HOSTS else parts.query
+    return urlunsplit((parts.scheme.lower(), host, parts.path, query, ""))
+
+
+def render_variants(data: bytes, width: int) -> Dict[str, bytes]:
+    """
+    원본 이미지를 가로 width 이하로 줄인 WebP/JPEG 사본 생성 (스레드 풀에서 실행)
+
+    Returns:
+        Dict[str, bytes]: 확장자 → 파일 내용
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image.seek(0)  # 애니메이션 GIF/WebP는 첫 프레임만 사용
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+        # JPEG은 투명도를 지원하지 않으므로 흰 배경에 합성
+        if image.mode == "RGBA":
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            rgb_image = background
+        else:
+            rgb_image = image
+
+        webp = io.BytesIO()
+        image.save(webp, "WEBP", quality=WEBP_QUALITY, method=6)
+        jpeg = io.BytesIO()
+        rgb_image.save(jpeg, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+    return {"webp": webp.getvalue(), "jpg": jpeg.getvalue()}
+
+
+class ThumbnailStore:
+    """원본 썸네일 URL → 로컬 축소본 매핑과 파일 저장소"""
+
+    def __init__(
+        self,
+        output_dir: str,
+        cache_path: str,
+        base_url: str = "thumbs/",
+        width: int = DEFAULT_WIDTH,
+        download_concurrency: int = 4,
+        workers: int = 2,
+    ):
+        self.output_dir = output_dir
+        self.cache_path = cache_path
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.width = width
+        self.download_concurrency = download_concurrency
+        self.workers = workers
+        self.entries: Dict[str, dict] = {}
+        self.reused = 0
+        self.downloaded = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def load(self):
+        """URL → 해시 매핑 읽기"""
+        data = load_json(self.cache_path, {}, "썸네일 저장소 캐시")
+        # 이미지 크기가 바뀌었으면 모든 사본을 다시 만듭니다.
+        if data.get("version") == CACHE_VERSION and data.get("width") == self.width:
+            self.entries = data.get("entries", {})
+
+    def save(self):
+        """URL → 해시 매핑 저장 (사본 크기와 함께 기록)"""
+        atomic_write_json(
+            self.cache_path,
+            {"version": CACHE_VERSION, "width": self.width, "entries": self.entries},
+        )
+
+    def _paths(self, digest: str) -> Dict[str, str]:
+        return {ext: os.path.join(self.output_dir, f"{digest}.{ext}") for ext in ("webp", "jpg")}
+
+    def _has_files(self, digest: str) -> bool:
+        return all(os.path.exists(path) for path in self._paths(digest).values())
+
+    async def _download(self, session: httpx.AsyncClient, url: str) -> Optional[bytes]:
+        try:
+            with metrics.timer("http.thumbnail"):
+                async with session.stream("GET", url, timeout=15.0, follow_redirects=True) as response:
+                    if response.status_code != 200:
+                        return None
+                    if not response.headers.get("content-type", "").startswith("image/"):
+                        return None
+                    buffer = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        buffer.extend(chunk)
+                        metrics.incr("http.thumbnail.bytes", len(chunk))
+                        if len(buffer) > MAX_SOURCE_BYTES:
+                            return None
+                    return bytes(buffer)
+        except (httpx.HTTPError, httpx.InvalidURL):
+            # 잘못된 주소나 네트워크 오류는 원본 URL을 그대로 사용
+            return None
+
+    async def _localize(
+        self,
+        session: httpx.AsyncClient,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+        allow_downloads: bool = True,
+    ):
+        key = source_key(url)
+        entry = self.entries.get(key)
+        if entry and self._has_files(entry["hash"]):
+            self.reused += 1
+            return
+        if not allow_downloads:
+            self.skipped += 1
+            return
+
+        async with semaphore:
+            data = await self._download(session, url)
+        if data is None:
+            self.failed += 1
+            return
+
+        digest = hashlib.sha256(data).hexdigest()[:20]
+        if not self._has_files(digest):
+            loop = asyncio.get_running_loop()
+            try:
+                with metrics.timer("thumbnail.render"):
+                    variants = await loop.run_in_executor(executor, render_variants, data, self.width)
+            except (Image.UnidentifiedImageError, OSError, ValueError, Image.DecompressionBombError) as e:
+                # 이미지가 아니거나 손상된 파일은 원본 URL을 그대로 사용
+                print(f"  -> 썸네일 변환 실패 ({url}): {e}", file=sys.stderr)
+                self.failed += 1
+                return
+            os.makedirs(self.output_dir, exist_ok=True)
+            for ext, path in self._paths(digest).items():
+                with open(path, "wb") as f:
+                    f.write(variants[ext])
+
+        # 쓰지 않는 항목은 localize_posts에서 정리하므로 사용 시각은 저장하지 않음
+        # (매 실행 캐시 파일이 바뀌지 않도록)
+        self.entries[key] = {"hash": digest}
+        self.downloaded += 1
+
+    async def localize_posts(
+        self,
+        session: httpx.AsyncClient,
+        posts: List[dict],
+        allow_downloads: bool = True,
+    ) -> List[dict]:
+        """
+        글 목록의 thumbnail을 로컬 축소본 경로로 바꾼 새 글 목록 반환
+
+        입력 글은 스냅샷에 저장된 원본이므로 수정하지 않습니다. 로컬 사본이 있는 글은
+        thumbnail(JPEG), thumbnailWebp, thumbnailSource(원본 URL)를 갖습니다.
+        지금 글에서 쓰지 않는 사본 파일과 캐시 항목은 정리합니다.
+        allow_downloads=False면 이미 있는 사본만 쓰고 새 썸네일은 원본 URL로 둡니다.
+        """
+        if Image is None:
+            print("   (Pillow 모듈이 없어 썸네일 축소를 건너뜁니다. pip install Pillow)")
+            return posts
+
+        urls = {post["thumbnail"] for post in posts if post.get("thumbnail")}
+        semaphore = asyncio.Semaphore(self.download_concurrency)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            async with asyncio.TaskGroup() as tg:
+                for url in urls:
+                    tg.create_task(self._localize(session, url, semaphore, executor, allow_downloads))
+
+        used_keys = {source_key(url) for url in urls}
+        self.entries = {key: entry for key, entry in self.entries.items() if key in used_keys}
+        self._prune_files({entry["hash"] for entry in self.entries.values()})
+
+        localized = []
+        for post in posts:
+            entry = self.entries.get(source_key(post["thumbnail"])) if post.get("thumbnail") else None
+            if entry is None:
+                localized.append(post)
+                continue
+            localized.append({
+                **post,
+                "thumbnail": f"{self.base_url}{entry['hash']}.jpg",
+                "thumbnailWebp": f"{self.base_url}{entry['hash']}.webp",
+                "thumbnailSource": post["thumbnail"],
+            })
+        return localized
+
+    def _prune_files(self, used_hashes: set):
+        if not os.path.isdir(self.output_dir):
+            return
+        # THUMBNAIL_DIR가 다른 이미지와 같이 쓰는 폴더여도 이 저장소가 만든 파일만 지움
+        for name in os.listdir(self.output_dir):
+            match = STORED_FILE_NAME.match(name)
+            if match and match.group(1) not in used_hashes:
+                os.remove(os.path.join(self.output_dir, name))
+
+    def summary(self) -> str:
+        """처리 통계 요약 문자열"""
+        return (f"썸네일 축소본: 재사용 {self.reused}, 새로 생성 {self.downloaded}, "
+                f"실패(원본 URL 유지) {self.failed}, 미룸 {self.skipped}, 항목 {len(self.entries)}개")
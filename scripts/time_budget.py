@@ -0,0 +1,70 @@
+"""
+실행 시간 예산
+
+예약 실행이 느린 블로그나 Discord rate limit 때문에 작업 시간 제한에 걸려 결과를 통째로 잃지 않도록,
+정해진 시간 안에서 할 수 있는 만큼만 처리하고 나머지는 다음 실행으로 미룹니다.
+
+    남은 시간 > 탐색 여유      모든 작업 진행
+    남은 시간 <= 탐색 여유     새 썸네일 탐색(외부 요청)을 시작하지 않음
+    남은 시간 <= 마무리 여유   새 스레드 처리를 시작하지 않고, 진행 중인 작업도 중단한 뒤 내보내기/저장
+
+마무리 여유는 내보내기와 캐시/스냅샷 저장에 쓸 시간입니다.
+예산 때문에 미룬 작업(스레드 id)은 deferred에 모아 두었다가 스냅샷에 저장해 다음 실행에서 먼저 처리합니다.
+"""
+
+import time
+from typing import Hashable, Optional, Set
+
+
+class TimeBudgetExceeded(Exception):
+    """새 작업을 시작할 시간이 남지 않음"""
+
+
+class TimeBudget:
+    """프로세스 시작 시각 기준 실행 시간 예산"""
+
+    def __init__(
+        self,
+        seconds: float,
+        reserve: Optional[float] = None,
+        lookup_reserve: Optional[float] = None,
+        started_at: Optional[float] = None,
+    ):
+        """
+        Args:
+            seconds: 전체 예산 (초)
+            reserve: 마무리 여유 (기본: 예산의 15%, 최대 120초)
+            lookup_reserve: 탐색 여유 (기본: 마무리 여유의 2배)
+            started_at: 예산 시작 시각 (time.monotonic 기준, 기본: 지금)
+        """
+        self.seconds = seconds
+        self.reserve = min(seconds * 0.15, 120.0) if reserve is None else reserve
+        self.lookup_reserve = self.reserve * 2 if lookup_reserve is None else max(lookup_reserve, self.reserve)
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.deferred: Set[Hashable] = set()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        return self.seconds - self.elapsed()
+
+    def processing_remaining(self) -> float:
+        """마무리 여유를 남기고 처리에 쓸 수 있는 시간 (초, 0 이상)"""
+        return max(0.0, self.remaining() - self.reserve)
+
+    def lookups_allowed(self) -> bool:
+        """새 썸네일 탐색을 시작해도 되는지"""
+        return self.remaining() > self.lookup_reserve
+
+    def check(self):
+        """새 작업을 시작할 시간이 없으면 TimeBudgetExceeded"""
+        if self.remaining() <= self.reserve:
+            raise TimeBudgetExceeded()
+
+    def defer(self, item_id: Hashable):
+        """예산 때문에 끝내지 못한 작업 기록"""
+        self.deferred.add(item_id)
+
+    def __str__(self) -> str:
+        return f"{self.seconds:.0f}초 (마무리 여유 {self.reserve:.0f}초, 탐색 여유 {self.lookup_reserve:.0f}초)"
@@ -14,6 +14,14 @@ from typing import List, Set, Tuple, Dict
 import discord
 from discord import Embed, Color
 
+from discord_rest import REST_ONLY, get_or_fetch_channel, run_rest_only
+from forum_snapshot import (
+    DEFAULT_SNAPSHOT_FILE, ForumSnapshot, count_thread_messages, resolve_threads, sync_forum_snapshot,
+)
+from member_index import MemberIndex
+from metrics import metrics
+from ranking import hot_score
+
 
 def get_last_week_range() -> Tuple[datetime, datetime]:
     """
@@ -53,14 +61,22 @@ def get_last_week_range() -> Tuple[datetime, datetime]:
 
 
 class ThreadInfo:
-    """포럼 스레드 정보"""
-    def __init__(self, thread: discord.Thread, message_count: int, reaction_count: int):
+    """
+    포럼 스레드 정보
+
+    HOT 스코어 계산에 실패한 스레드도 작성자 판단에는 필요하므로 scored=False로 만들어
+    메시지/반응 수는 0, hot_score는 None으로 둡니다.
+    """
+    def __init__(self, thread: discord.Thread, message_count: int, reaction_count: int, scored: bool = True):
         self.thread = thread
         self.author = thread.owner
+        self.owner_id = thread.owner_id
         self.created_at = thread.created_at
         self.message_count = message_count
+        # 댓글 수 = 시작 메시지를 뺀 메시지 수 (포럼 내보내기의 comments와 같은 기준)
+        self.comment_count = max(0, message_count - 1)
         self.reaction_count = reaction_count
-        self.hot_score = message_count + reaction_count
+        self.hot_score = hot_score(self.comment_count, reaction_count) if scored else None
         self.title = thread.name
         self.url = thread.jump_url
 
@@ -68,119 +84,144 @@ class ThreadInfo:
         return f"ThreadInfo(title={self.title}, author={self.author}, hot_score={self.hot_score})"
 
 
+async def score_thread(thread: discord.Thread, snapshot: ForumSnapshot) -> ThreadInfo:
+    """
+    스레드 하나의 메시지 수와 시작 메시지 반응 수를 계산해 ThreadInfo로 반환
+
+    Args:
+        thread: Discord 스레드
+        snapshot: 메시지 수 캐시/결과 저장에 사용할 스냅샷
+
+    Returns:
+        ThreadInfo: HOT 스코어가 계산된 스레드 정보
+    """
+    # 메시지 수 계산 (스레드 메타데이터 → 스냅샷 캐시 → history 순)
+    message_count = await count_thread_messages(thread, snapshot)
+
+    # 시작 메시지의 반응 수 계산
+    reaction_count = 0
+    if thread.starter_message:
+        starter_msg = thread.starter_message
+    else:
+        # starter_message가 없으면 첫 메시지 가져오기
+        try:
+            with metrics.timer("discord.fetch_message"):
+                starter_msg = await thread.fetch_message(thread.id)
+        except discord.HTTPException:
+            starter_msg = None
+
+    if starter_msg and starter_msg.reactions:
+        for reaction in starter_msg.reactions:
+            reaction_count += reaction.count
+
+    snapshot.upsert_thread(thread, starter_msg, message_count=message_count)
+    return ThreadInfo(thread, message_count, reaction_count)
+
+
 async def fetch_forum_threads(
     forum_channel: discord.ForumChannel,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    concurrency: int = 5,
+    thread_timeout: float = 30.0,
+    snapshot_path: str = DEFAULT_SNAPSHOT_FILE,
+    rest_only: bool = REST_ONLY
 ) -> List[ThreadInfo]:
     """
     포럼 채널에서 지정된 기간의 스레드 정보를 가져옴
 
+    스레드별 HOT 스코어 계산은 최대 concurrency개씩 동시에 진행하며,
+    thread_timeout초 안에 끝나지 않거나 실패한 스레드는 오류 요약에 포함하고, 작성자 판단에는
+    그대로 쓰이도록 HOT 스코어 없이(scored=False) 결과에 넣습니다.
+
     Args:
         forum_channel: Discord 포럼 채널
         start_date: 시작 일시 (UTC)
         end_date: 종료 일시 (UTC)
+        concurrency: 동시에 처리할 스레드 수
+        thread_timeout: 스레드 하나당 최대 처리 시간 (초)
+        snapshot_path: 포럼 스냅샷 파일 경로
+        rest_only: True면 활성 스레드를 REST로 조회
 
     Returns:
-        List[ThreadInfo]: 스레드 정보 목록
+        List[ThreadInfo]: 스레드 정보 목록 (생성 시각 순)
     """
-    threads_info = []
-
     print(f"\n📖 포럼 채널 '{forum_channel.name}'에서 스레드 가져오는 중...")
 
-    # 활성 스레드와 아카이브된 스레드 모두 가져오기
-    all_threads = []
+    # 로컬 스냅샷을 마지막 동기화 이후 바뀐 스레드로만 갱신한 뒤,
+    # 기간 내 스레드는 스냅샷 인덱스에서 찾습니다. (전체 아카이브를 다시 훑지 않음)
+    snapshot = ForumSnapshot(snapshot_path)
+    snapshot.load()
+    synced_threads = await sync_forum_snapshot(forum_channel, snapshot, not_before=start_date, rest_only=rest_only)
 
-    # 활성 스레드
-    all_threads.extend(forum_channel.threads)
+    records = snapshot.threads_between(start_date, end_date)
+    all_threads = await resolve_threads(forum_channel, snapshot, records, synced_threads)
 
-    # 아카이브된 스레드
-    async for thread in forum_channel.archived_threads(limit=None):
-        all_threads.append(thread)
+    print(f"   기간 내 스레드 {len(all_threads)}개 발견 (동시 처리: {concurrency}개)")
 
-    print(f"   총 {len(all_threads)}개의 스레드 발견")
+    semaphore = asyncio.Semaphore(concurrency)
+    errors: List[Tuple[str, str]] = []
 
-    for thread in all_threads:
-        # 스레드 생성 시간 확인
-        if not thread.created_at:
-            continue
+    async def score_limited(thread: discord.Thread) -> ThreadInfo:
+        async with semaphore:
+            try:
+                thread_info = await asyncio.wait_for(score_thread(thread, snapshot), timeout=thread_timeout)
+            except asyncio.TimeoutError:
+                errors.append((thread.name, f"{thread_timeout:.0f}초 시간 초과"))
+                return ThreadInfo(thread, 0, 0, scored=False)
+            except Exception as e:
+                errors.append((thread.name, str(e)))
+                return ThreadInfo(thread, 0, 0, scored=False)
 
-        # UTC aware datetime으로 변환
-        thread_created = thread.created_at
-        if thread_created.tzinfo is None:
-            thread_created = thread_created.replace(tzinfo=timezone.utc)
+        print(f"   ✅ '{thread.name}' by {thread.owner.display_name if thread.owner else 'Unknown'} "
+              f"(댓글: {thread_info.comment_count}, 반응: {thread_info.reaction_count}, HOT: {thread_info.hot_score})")
+        return thread_info
 
-        # 기간 확인
-        if not (start_date <= thread_created <= end_date):
-            continue
+    # gather는 완료 순서와 상관없이 all_threads 순서대로 결과를 반환
+    results = await asyncio.gather(*(score_limited(thread) for thread in all_threads))
+    threads_info = list(results)
 
-        try:
-            # 메시지 수 계산 (대략적인 수)
-            message_count = 0
-            async for _ in thread.history(limit=None):
-                message_count += 1
-
-            # 시작 메시지의 반응 수 계산
-            reaction_count = 0
-            if thread.starter_message:
-                starter_msg = thread.starter_message
-            else:
-                # starter_message가 없으면 첫 메시지 가져오기
-                try:
-                    starter_msg = await thread.fetch_message(thread.id)
-                except:
-                    starter_msg = None
-
-            if starter_msg and starter_msg.reactions:
-                for reaction in starter_msg.reactions:
-                    reaction_count += reaction.count
-
-            thread_info = ThreadInfo(thread, message_count, reaction_count)
-            threads_info.append(thread_info)
-
-            print(f"   ✅ '{thread.name}' by {thread.owner.display_name if thread.owner else 'Unknown'} "
-                  f"(메시지: {message_count}, 반응: {reaction_count}, HOT: {thread_info.hot_score})")
+    snapshot.save()
 
-        except Exception as e:
-            print(f"   ⚠️  스레드 '{thread.name}' 처리 중 오류: {e}")
-            continue
+    if errors:
+        print(f"\n⚠️  {len(errors)}개 스레드 HOT 스코어 계산 실패 (작성 여부 판단에는 포함):")
+        for title, error in errors:
+            print(f"   - '{title}': {error}")
 
     print(f"\n📊 총 {len(threads_info)}개의 글이 기간 내에 작성됨")
     return threads_info
 
 
-def analyze_threads(
+async def analyze_threads(
     threads: List[ThreadInfo],
     target_users: Set[str],
-    guild: discord.Guild
+    member_index: MemberIndex
 ) -> Tuple[Dict[str, discord.Member], Dict[str, discord.Member]]:
     """
     스레드를 분석하여 작성자와 미작성자를 구분
 
     Args:
         threads: 스레드 정보 목록
-        target_users: 대상 사용자 username 목록
-        guild: Discord 서버
+        target_users: 대상 사용자 목록 (username 또는 사용자 id)
+        member_index: 서버 멤버 조회 인덱스
 
     Returns:
         Tuple[Dict[str, discord.Member], Dict[str, discord.Member]]: (작성한 멤버, 작성하지 않은 멤버)
     """
-    # username으로 멤버 찾기
-    target_members = {}
-    for username in target_users:
-        member = discord.utils.get(guild.members, name=username)
-        if member:
-            target_members[username] = member
-        else:
-            print(f"⚠️  '{username}' 멤버를 찾을 수 없습니다.")
+    # 대상 사용자를 멤버로 변환
+    target_members = await member_index.resolve_targets(target_users)
+
+    # 작성한 멤버 찾기 (작성자 id로 비교, 멤버를 찾지 못한 대상은 username으로 비교)
+    author_ids = {thread_info.owner_id for thread_info in threads}
+    authors_by_name = {thread_info.author.name: thread_info.author for thread_info in threads if thread_info.author}
 
-    # 작성한 멤버 찾기
     authors = {}
-    for thread_info in threads:
-        if thread_info.author:
-            username = thread_info.author.name
-            if username in target_users:
-                authors[username] = thread_info.author
+    for target in target_users:
+        member = target_members.get(target)
+        if member and member.id in author_ids:
+            authors[target] = member
+        elif member is None and target in authors_by_name:
+            authors[target] = authors_by_name[target]
 
     # 미작성자
     non_authors_usernames = target_users - set(authors.keys())
@@ -195,7 +236,7 @@ def analyze_threads(
 
 def get_top_hot_threads(threads: List[ThreadInfo], top_n: int = 3) -> List[ThreadInfo]:
     """
-    HOT 스코어 기준 상위 N개 스레드 반환
+    HOT 스코어 기준 상위 N개 스레드 반환 (스코어 계산에 실패한 스레드 제외)
 
     Args:
         threads: 스레드 정보 목록
@@ -204,7 +245,8 @@ def get_top_hot_threads(threads: List[ThreadInfo], top_n: int = 3) -> List[Threa
     Returns:
         List[ThreadInfo]: HOT 스코어 상위 스레드 목록
     """
-    sorted_threads = sorted(threads, key=lambda x: x.hot_score, reverse=True)
+    scored_threads = [thread_info for thread_info in threads if thread_info.hot_score is not None]
+    sorted_threads = sorted(scored_threads, key=lambda x: x.hot_score, reverse=True)
     return sorted_threads[:top_n]
 
 
@@ -294,7 +336,7 @@ def create_hot_thread_embed(thread_info: ThreadInfo, rank: int) -> Embed:
         embed.set_author(name=author_name, icon_url=author_avatar)
 
     # 통계 정보
-    embed.add_field(name="💬 댓글", value=str(thread_info.message_count), inline=True)
+    embed.add_field(name="💬 댓글", value=str(thread_info.comment_count), inline=True)
     embed.add_field(name="❤️ 반응", value=str(thread_info.reaction_count), inline=True)
 
     # 썸네일 (작성자 프로필 사진)
@@ -340,7 +382,15 @@ async def run_weekly_check():
         print(f"❌ 채널 ID가 올바른 숫자가 아닙니다.")
         return
 
-    # 대상 사용자 목록 파싱 (쉼표로 구분, 공백 제거)
+    # HOT 스코어 계산 동시 처리 수 / 스레드당 제한 시간 (선택)
+    try:
+        hot_score_concurrency = max(1, int(os.getenv("HOT_SCORE_CONCURRENCY", "5")))
+        thread_timeout = float(os.getenv("THREAD_TIMEOUT_SECONDS", "30"))
+    except ValueError:
+        print("❌ HOT_SCORE_CONCURRENCY / THREAD_TIMEOUT_SECONDS가 올바른 숫자가 아닙니다.")
+        return
+
+    # 대상 사용자 목록 파싱 (쉼표로 구분, 공백 제거, username 또는 숫자 사용자 id)
     target_users = set(user.strip() for user in target_users_str.split(",") if user.strip())
     print(f"👥 대상 사용자 ({len(target_users)}명): {', '.join(sorted(target_users))}\n")
 
@@ -350,7 +400,9 @@ async def run_weekly_check():
     intents.members = True
     intents.guilds = True
 
-    client = discord.Client(intents=intents)
+    # 시작 시 서버 전체 멤버 목록을 받아오지 않음 (필요한 멤버만 MemberIndex로 조회)
+    # DISCORD_REST_ONLY=1 이면 게이트웨이에 연결하지 않고 필요한 정보를 REST로 조회
+    client = discord.Client(intents=intents, chunk_guilds_at_startup=False)
 
     @client.event
     async def on_ready():
@@ -358,50 +410,62 @@ async def run_weekly_check():
 
         try:
             # 포럼 채널 가져오기
-            forum_channel = client.get_channel(forum_channel_id)
+            forum_channel = await get_or_fetch_channel(client, forum_channel_id)
             if not forum_channel or not isinstance(forum_channel, discord.ForumChannel):
                 print(f"❌ 포럼 채널을 찾을 수 없습니다: {forum_channel_id}")
                 await client.close()
                 return
 
             # 알림 채널 가져오기
-            notification_channel = client.get_channel(notification_channel_id)
+            notification_channel = await get_or_fetch_channel(client, notification_channel_id)
             if not notification_channel:
                 print(f"❌ 알림 채널을 찾을 수 없습니다: {notification_channel_id}")
                 await client.close()
                 return
 
-            # 서버 정보
-            guild = forum_channel.guild
+            # 서버 멤버 조회 인덱스 (실행당 한 번 생성)
+            member_index = MemberIndex(forum_channel.guild, rest_only=REST_ONLY)
 
             # 지난주 월~일요일 범위 계산
             start_date, end_date = get_last_week_range()
 
             # 포럼 스레드 가져오기
-            threads = await fetch_forum_threads(forum_channel, start_date, end_date)
+            with metrics.phase("fetch_threads"):
+                threads = await fetch_forum_threads(
+                    forum_channel, start_date, end_date,
+                    concurrency=hot_score_concurrency,
+                    thread_timeout=thread_timeout,
+                    rest_only=REST_ONLY
+                )
 
             if not threads:
                 print("⚠️  지난주에 작성된 글이 없습니다.")
                 # 빈 결과로 메시지 전송
-                embed = create_embed({}, dict.fromkeys(target_users, None), start_date, end_date)
-                await notification_channel.send(embed=embed)
-                await client.close()
+                authors, non_authors = await analyze_threads([], target_users, member_index)
+                embed = create_embed(authors, non_authors, start_date, end_date)
+                with metrics.timer("discord.channel_send"):
+                    await notification_channel.send(embed=embed)
                 return
 
             # 스레드 분석
-            authors, non_authors = analyze_threads(threads, target_users, guild)
+            with metrics.phase("analyze"):
+                authors, non_authors = await analyze_threads(threads, target_users, member_index)
 
             # HOT 글 Top 3
             hot_threads = get_top_hot_threads(threads, top_n=3)
             print(f"\n🔥 HOT 글 Top {len(hot_threads)}:")
             for i, thread_info in enumerate(hot_threads, 1):
+                # 멤버 캐시에 없던 작성자는 임베드 표시를 위해 개별 조회
+                if thread_info.author is None and thread_info.owner_id:
+                    thread_info.author = await member_index.resolve_id(thread_info.owner_id)
                 print(f"   {i}. {thread_info.title} (HOT: {thread_info.hot_score})")
 
             # Discord Embed 생성
             main_embed = create_embed(authors, non_authors, start_date, end_date)
 
             # 메시지 전송 - 메인 임베드
-            await notification_channel.send(embed=main_embed)
+            with metrics.timer("discord.channel_send"):
+                await notification_channel.send(embed=main_embed)
             print(f"\n✅ 메인 메시지 전송 완료: #{notification_channel.name}")
 
             # HOT 글 임베드 전송
@@ -409,7 +473,8 @@ async def run_weekly_check():
                 print(f"🔥 HOT 글 임베드 전송 중...")
                 for i, thread_info in enumerate(hot_threads, 1):
                     hot_embed = create_hot_thread_embed(thread_info, i)
-                    await notification_channel.send(embed=hot_embed)
+                    with metrics.timer("discord.channel_send"):
+                        await notification_channel.send(embed=hot_embed)
                     print(f"   ✅ {i}위 임베드 전송 완료")
 
             print(f"\n✅ 모든 메시지 전송 완료!")
@@ -419,10 +484,14 @@ async def run_weekly_check():
             import traceback
             traceback.print_exc()
         finally:
+            metrics.emit("weekly_check")
             await client.close()
 
     try:
-        await client.start(discord_token)
+        if REST_ONLY:
+            await run_rest_only(client, discord_token, on_ready)
+        else:
+            await client.start(discord_token)
     except discord.LoginFailure:
         print("❌ Discord Bot 로그인 실패. 토큰을 확인해주세요.")
     except Exception as e:
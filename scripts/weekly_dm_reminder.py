@@ -8,10 +8,17 @@
 
 import os
 import asyncio
+import random
 from datetime import datetime, timedelta, timezone
-from typing import List, Set, Tuple, Dict
+from typing import List, Optional, Set, Tuple, Dict
 import discord
 
+from discord_rest import REST_ONLY, get_or_fetch_channel, run_rest_only
+from dm_ledger import DEFAULT_LEDGER_FILE, DeliveryLedger, iso_week_key
+from forum_snapshot import DEFAULT_SNAPSHOT_FILE, ForumSnapshot, resolve_threads, sync_forum_snapshot
+from member_index import MemberIndex
+from metrics import metrics
+
 
 def get_current_week_range() -> Tuple[datetime, datetime]:
     """
@@ -49,7 +56,9 @@ def get_current_week_range() -> Tuple[datetime, datetime]:
 async def fetch_forum_threads(
     forum_channel: discord.ForumChannel,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    snapshot_path: str = DEFAULT_SNAPSHOT_FILE,
+    rest_only: bool = REST_ONLY
 ) -> List[discord.Thread]:
     """
     포럼 채널에서 지정된 기간의 스레드를 가져옴
@@ -58,6 +67,8 @@ async def fetch_forum_threads(
         forum_channel: Discord 포럼 채널
         start_date: 시작 일시 (UTC)
         end_date: 종료 일시 (UTC)
+        snapshot_path: 포럼 스냅샷 파일 경로
+        rest_only: True면 활성 스레드를 REST로 조회
 
     Returns:
         List[discord.Thread]: 스레드 목록
@@ -66,71 +77,57 @@ async def fetch_forum_threads(
 
     print(f"\n📖 포럼 채널 '{forum_channel.name}'에서 스레드 가져오는 중...")
 
-    # 활성 스레드와 아카이브된 스레드 모두 가져오기
-    all_threads = []
-
-    # 활성 스레드
-    all_threads.extend(forum_channel.threads)
+    # 로컬 스냅샷을 마지막 동기화 이후 바뀐 스레드로만 갱신한 뒤,
+    # 기간 내 스레드는 스냅샷 인덱스에서 찾습니다. (전체 아카이브를 다시 훑지 않음)
+    snapshot = ForumSnapshot(snapshot_path)
+    snapshot.load()
+    synced_threads = await sync_forum_snapshot(forum_channel, snapshot, not_before=start_date, rest_only=rest_only)
 
-    # 아카이브된 스레드
-    async for thread in forum_channel.archived_threads(limit=None):
-        all_threads.append(thread)
+    records = snapshot.threads_between(start_date, end_date)
+    all_threads = await resolve_threads(forum_channel, snapshot, records, synced_threads)
 
-    print(f"   총 {len(all_threads)}개의 스레드 발견")
+    print(f"   기간 내 스레드 {len(all_threads)}개 발견")
 
     for thread in all_threads:
-        # 스레드 생성 시간 확인
-        if not thread.created_at:
-            continue
-
-        # UTC aware datetime으로 변환
-        thread_created = thread.created_at
-        if thread_created.tzinfo is None:
-            thread_created = thread_created.replace(tzinfo=timezone.utc)
-
-        # 기간 확인
-        if not (start_date <= thread_created <= end_date):
-            continue
-
         threads_list.append(thread)
         print(f"   ✅ '{thread.name}' by {thread.owner.display_name if thread.owner else 'Unknown'}")
 
+    snapshot.save()
+
     print(f"\n📊 총 {len(threads_list)}개의 글이 기간 내에 작성됨")
     return threads_list
 
 
-def analyze_threads(
+async def analyze_threads(
     threads: List[discord.Thread],
     target_users: Set[str],
-    guild: discord.Guild
+    member_index: MemberIndex
 ) -> Tuple[Dict[str, discord.Member], Dict[str, discord.Member]]:
     """
     스레드를 분석하여 작성자와 미작성자를 구분
 
     Args:
         threads: 스레드 목록
-        target_users: 대상 사용자 username 목록
-        guild: Discord 서버
+        target_users: 대상 사용자 목록 (username 또는 사용자 id)
+        member_index: 서버 멤버 조회 인덱스
 
     Returns:
         Tuple[Dict[str, discord.Member], Dict[str, discord.Member]]: (작성한 멤버, 작성하지 않은 멤버)
     """
-    # username으로 멤버 찾기
-    target_members = {}
-    for username in target_users:
-        member = discord.utils.get(guild.members, name=username)
-        if member:
-            target_members[username] = member
-        else:
-            print(f"⚠️  '{username}' 멤버를 찾을 수 없습니다.")
+    # 대상 사용자를 멤버로 변환
+    target_members = await member_index.resolve_targets(target_users)
+
+    # 작성한 멤버 찾기 (작성자 id로 비교, 멤버를 찾지 못한 대상은 username으로 비교)
+    author_ids = {thread.owner_id for thread in threads}
+    authors_by_name = {thread.owner.name: thread.owner for thread in threads if thread.owner}
 
-    # 작성한 멤버 찾기
     authors = {}
-    for thread in threads:
-        if thread.owner:
-            username = thread.owner.name
-            if username in target_users:
-                authors[username] = thread.owner
+    for target in target_users:
+        member = target_members.get(target)
+        if member and member.id in author_ids:
+            authors[target] = member
+        elif member is None and target in authors_by_name:
+            authors[target] = authors_by_name[target]
 
     # 미작성자
     non_authors_usernames = target_users - set(authors.keys())
@@ -143,47 +140,124 @@ def analyze_threads(
     return authors, non_authors
 
 
-async def send_dm_to_member(member: discord.Member, message: str) -> bool:
+class DMResult:
+    """멤버 한 명에 대한 DM 전송 결과"""
+    def __init__(self, username: str, member: discord.Member, success: bool, attempts: int,
+                 error: Optional[str] = None):
+        self.username = username
+        self.member = member
+        self.success = success
+        self.attempts = attempts
+        self.error = error
+
+    def __repr__(self):
+        return f"DMResult(member={self.member}, success={self.success}, attempts={self.attempts}, error={self.error})"
+
+
+def is_retryable_error(error: discord.HTTPException) -> bool:
+    """
+    다시 보내도 안전한 오류인지 확인 (429만)
+
+    5xx는 Discord가 메시지를 이미 전달한 뒤에도 돌아올 수 있어, 다시 보내면 DM이 중복될 수 있습니다.
+    """
+    return error.status == 429
+
+
+async def send_dm_to_member(
+    username: str,
+    member: discord.Member,
+    message: str,
+    max_attempts: int = 4,
+    backoff_base: float = 1.0
+) -> DMResult:
     """
     특정 멤버에게 DM을 전송
 
+    Rate limit 헤더에 따른 대기와 429 재시도는 discord.py HTTP 클라이언트가 버킷 단위로 처리하며,
+    그래도 실패한 429는 지수 백오프 + 지터로 다시 시도합니다.
+    5xx는 전송 여부를 알 수 없으므로 중복 DM을 피하기 위해 다시 시도하지 않고 실패로 기록합니다.
+
     Args:
+        username: TARGET_USERS 항목
         member: Discord 멤버
         message: 전송할 메시지
+        max_attempts: 최대 시도 횟수
+        backoff_base: 첫 재시도 전 대기 시간 (초), 시도마다 2배
 
     Returns:
-        bool: 성공 여부
+        DMResult: 전송 결과
     """
-    try:
-        await member.send(message)
-        print(f"   ✅ DM 전송 완료: {member.display_name}")
-        return True
-    except discord.Forbidden:
-        print(f"   ⚠️  DM 전송 실패 (권한 없음): {member.display_name}")
-        return False
-    except discord.HTTPException as e:
-        print(f"   ⚠️  DM 전송 실패 (HTTP 오류): {member.display_name} - {e}")
-        return False
-    except Exception as e:
-        print(f"   ⚠️  DM 전송 실패 (기타 오류): {member.display_name} - {e}")
-        return False
+    for attempt in range(1, max_attempts + 1):
+        try:
+            with metrics.timer("discord.send_dm"):
+                await member.send(message)
+            print(f"   ✅ DM 전송 완료: {member.display_name}")
+            return DMResult(username, member, True, attempt)
+        except discord.Forbidden:
+            print(f"   ⚠️  DM 전송 실패 (권한 없음): {member.display_name}")
+            return DMResult(username, member, False, attempt, "권한 없음")
+        except discord.RateLimited as e:
+            # discord.py가 기다리지 않고 넘긴 긴 rate limit
+            error, delay = f"Rate limit ({e.retry_after:.1f}초)", e.retry_after
+        except discord.HTTPException as e:
+            if not is_retryable_error(e):
+                print(f"   ⚠️  DM 전송 실패 (HTTP 오류): {member.display_name} - {e}")
+                return DMResult(username, member, False, attempt, f"HTTP {e.status}")
+            error, delay = f"HTTP {e.status}", backoff_base * (2 ** (attempt - 1))
+        except Exception as e:
+            print(f"   ⚠️  DM 전송 실패 (기타 오류): {member.display_name} - {e}")
+            return DMResult(username, member, False, attempt, str(e))
+
+        if attempt < max_attempts:
+            metrics.incr("dm.retries")
+            delay += random.uniform(0, backoff_base)
+            print(f"   🔁 DM 재시도 대기 ({error}): {member.display_name} - {delay:.1f}초")
+            await asyncio.sleep(delay)
 
+    print(f"   ⚠️  DM 전송 실패 (재시도 초과): {member.display_name} - {error}")
+    return DMResult(username, member, False, max_attempts, error)
 
-async def send_dms_to_non_authors(non_authors: Dict[str, discord.Member], start_date: datetime):
+
+async def send_dms_to_non_authors(
+    non_authors: Dict[str, discord.Member],
+    start_date: datetime,
+    concurrency: int = 5,
+    ledger_path: str = DEFAULT_LEDGER_FILE
+) -> List[DMResult]:
     """
-    미작성자들에게 DM을 전송
+    미작성자들에게 DM을 동시에 전송
+
+    이번 주차 DM 전송 기록(ledger)에 있는 멤버는 건너뛰므로,
+    실패 후 다시 실행해도 아직 받지 못한 멤버에게만 전송합니다.
 
     Args:
         non_authors: 미작성자 딕셔너리
         start_date: 이번주 시작일
+        concurrency: 동시에 전송할 DM 수
+        ledger_path: DM 전송 기록 파일 경로
+
+    Returns:
+        List[DMResult]: 멤버별 전송 결과
     """
     if not non_authors:
         print("\n✅ 모두 블로그를 작성했습니다! DM을 보낼 필요가 없습니다.")
-        return
+        return []
 
     kst_offset = timedelta(hours=9)
     start_kst = start_date.astimezone(timezone(kst_offset))
 
+    # 이번 주차에 이미 DM을 받은 멤버 제외
+    ledger = DeliveryLedger(iso_week_key(start_kst), ledger_path)
+    ledger.load()
+    pending = {username: member for username, member in non_authors.items() if not ledger.is_delivered(member.id)}
+    skipped_count = len(non_authors) - len(pending)
+    metrics.incr("dm.skipped", skipped_count)
+    if skipped_count:
+        print(f"\n⏭️  {ledger.week_key}에 이미 DM을 받은 {skipped_count}명은 건너뜁니다.")
+    if not pending:
+        print("\n✅ 모든 미작성자에게 이미 DM을 보냈습니다.")
+        return []
+
     # DM 메시지 작성
     dm_message = f"""안녕하세요! 👋
 
@@ -193,24 +267,36 @@ Blog-Or-Death 챌린지를 진행 중이니, 이번 주 일요일까지 블로
 
 화이팅! 🔥"""
 
-    print(f"\n📨 미작성자 {len(non_authors)}명에게 DM 전송 중...")
+    print(f"\n📨 미작성자 {len(pending)}명에게 DM 전송 중... (동시 전송: {concurrency}개)")
 
-    success_count = 0
-    fail_count = 0
+    # 고정 딜레이 대신 동시 전송 수만 제한하고, 속도 조절은 rate limit 응답에 맡깁니다.
+    semaphore = asyncio.Semaphore(concurrency)
 
-    for username, member in non_authors.items():
-        success = await send_dm_to_member(member, dm_message)
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
+    async def send_limited(username: str, member: discord.Member) -> DMResult:
+        async with semaphore:
+            result = await send_dm_to_member(username, member, dm_message)
+        if result.success:
+            # 성공할 때마다 바로 기록해 중간에 중단되어도 중복 전송하지 않음
+            ledger.record(member.id)
+        return result
+
+    results = await asyncio.gather(*(
+        send_limited(username, member) for username, member in sorted(pending.items())
+    ))
 
-        # DM 전송 간 짧은 딜레이 (Rate Limit 방지)
-        await asyncio.sleep(1)
+    success_count = sum(1 for result in results if result.success)
+    fail_count = len(results) - success_count
+    metrics.incr("dm.sent", success_count)
+    metrics.incr("dm.failed", fail_count)
 
     print(f"\n📊 DM 전송 결과:")
     print(f"   ✅ 성공: {success_count}명")
     print(f"   ⚠️  실패: {fail_count}명")
+    for result in results:
+        if not result.success:
+            print(f"      - {result.member.display_name}: {result.error} (시도 {result.attempts}회)")
+
+    return results
 
 
 async def run_weekly_dm_check():
@@ -241,7 +327,14 @@ async def run_weekly_dm_check():
         print(f"❌ 채널 ID가 올바른 숫자가 아닙니다.")
         return
 
-    # 대상 사용자 목록 파싱 (쉼표로 구분, 공백 제거)
+    # DM 동시 전송 수 (선택)
+    try:
+        dm_concurrency = max(1, int(os.getenv("DM_CONCURRENCY", "5")))
+    except ValueError:
+        print("❌ DM_CONCURRENCY가 올바른 숫자가 아닙니다.")
+        return
+
+    # 대상 사용자 목록 파싱 (쉼표로 구분, 공백 제거, username 또는 숫자 사용자 id)
     target_users = set(user.strip() for user in target_users_str.split(",") if user.strip())
     print(f"👥 대상 사용자 ({len(target_users)}명): {', '.join(sorted(target_users))}\n")
 
@@ -251,7 +344,9 @@ async def run_weekly_dm_check():
     intents.members = True
     intents.guilds = True
 
-    client = discord.Client(intents=intents)
+    # 시작 시 서버 전체 멤버 목록을 받아오지 않음 (필요한 멤버만 MemberIndex로 조회)
+    # DISCORD_REST_ONLY=1 이면 게이트웨이에 연결하지 않고 필요한 정보를 REST로 조회
+    client = discord.Client(intents=intents, chunk_guilds_at_startup=False)
 
     @client.event
     async def on_ready():
@@ -259,26 +354,29 @@ async def run_weekly_dm_check():
 
         try:
             # 포럼 채널 가져오기
-            forum_channel = client.get_channel(forum_channel_id)
+            forum_channel = await get_or_fetch_channel(client, forum_channel_id)
             if not forum_channel or not isinstance(forum_channel, discord.ForumChannel):
                 print(f"❌ 포럼 채널을 찾을 수 없습니다: {forum_channel_id}")
                 await client.close()
                 return
 
-            # 서버 정보
-            guild = forum_channel.guild
+            # 서버 멤버 조회 인덱스 (실행당 한 번 생성)
+            member_index = MemberIndex(forum_channel.guild, rest_only=REST_ONLY)
 
             # 이번주 월~현재 범위 계산
             start_date, end_date = get_current_week_range()
 
             # 포럼 스레드 가져오기
-            threads = await fetch_forum_threads(forum_channel, start_date, end_date)
+            with metrics.phase("fetch_threads"):
+                threads = await fetch_forum_threads(forum_channel, start_date, end_date, rest_only=REST_ONLY)
 
             # 스레드 분석
-            authors, non_authors = analyze_threads(threads, target_users, guild)
+            with metrics.phase("analyze"):
+                authors, non_authors = await analyze_threads(threads, target_users, member_index)
 
             # 미작성자에게 DM 전송
-            await send_dms_to_non_authors(non_authors, start_date)
+            with metrics.phase("send_dms"):
+                await send_dms_to_non_authors(non_authors, start_date, concurrency=dm_concurrency)
 
             print(f"\n✅ 모든 작업 완료!")
 
@@ -287,10 +385,14 @@ async def run_weekly_dm_check():
             import traceback
             traceback.print_exc()
         finally:
+            metrics.emit("weekly_dm_reminder")
             await client.close()
 
     try:
-        await client.start(discord_token)
+        if REST_ONLY:
+            await run_rest_only(client, discord_token, on_ready)
+        else:
+            await client.start(discord_token)
     except discord.LoginFailure:
         print("❌ Discord Bot 로그인 실패. 토큰을 확인해주세요.")
     except Exception as e:
@@ -14,7 +14,12 @@ const PostCard: React.FC<PostCardProps> = ({ post }) => {
     >
       {post.thumbnail && (
         <div className="post-thumbnail">
-          <img src={post.thumbnail} alt={post.title} />
+          <picture>
+            {post.thumbnailWebp && (
+              <source srcSet={post.thumbnailWebp} type="image/webp" />
+            )}
+            <img src={post.thumbnail} alt={post.title} loading="lazy" />
+          </picture>
         </div>
       )}
       <div className="post-content">
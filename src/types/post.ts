@@ -3,6 +3,9 @@ export interface Post {
   title: string;
   content: string;
   thumbnail: string | null;
+  // 썸네일 축소본(LOCALIZE_THUMBNAILS)을 만든 경우: WebP 사본과 원본 URL
+  thumbnailWebp?: string;
+  thumbnailSource?: string;
   author: string;
   author_avatar: string;
   url: string;
@@ -14,3 +17,33 @@ export interface Post {
 export type TabType = "trending" | "curated" | "recent" | "feed";
 
 export type ThemeMode = "light" | "dark";
+
+// 분할 내보내기(forum/)의 목록 항목. 스레드 id는 number 정밀도를 넘으므로 문자열입니다.
+export interface PostSummary {
+  id: string;
+  title: string;
+  author: string;
+  author_avatar: string;
+  url: string | null;
+  thumbnail: string | null;
+  thumbnailWebp?: string;
+  createdAt: string;
+  likes?: number;
+  comments?: number;
+}
+
+// forum/index.json
+export interface ForumIndex {
+  total: number;
+  pageSize: number;
+  pages: string[];
+  months: { month: string; count: number; file: string }[];
+  postPath: string;
+}
+
+// forum/rankings.json: 미리 정렬된 글 id 목록 (탭에서는 잘라 쓰기만 하면 됩니다)
+export interface ForumRankings {
+  trending: string[];
+  recent: string[];
+  authors: Record<string, string[]>;
+}